@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Migration script to add stored deposit amounts to tenancy_agreements table
+and backfill them from the monthly rent
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.main import app
+from src.models.user import db
+from sqlalchemy import text
+
+def migrate_agreement_deposit_amounts():
+    """Add and backfill utility_deposit and total_deposit on tenancy_agreements"""
+
+    with app.app_context():
+        try:
+            migrations = [
+                ("utility_deposit", "NUMERIC(10,2)", "Utility deposit (0.5 month rent)"),
+                ("total_deposit", "NUMERIC(10,2)", "Security plus utility deposit")
+            ]
+
+            for column_name, column_type, description in migrations:
+                db.session.execute(text(
+                    f'ALTER TABLE tenancy_agreements ADD COLUMN IF NOT EXISTS {column_name} {column_type}'
+                ))
+                print(f'✅ Added {column_name} column - {description}')
+
+            # Backfill using the standard 2 months security + 0.5 month utility
+            result = db.session.execute(text("""
+                UPDATE tenancy_agreements
+                SET security_deposit = monthly_rent * 2,
+                    utility_deposit = monthly_rent * 0.5,
+                    total_deposit = monthly_rent * 2.5
+                WHERE total_deposit IS NULL
+            """))
+            print(f'✅ Backfilled deposit amounts for {result.rowcount} agreements')
+
+            db.session.commit()
+            print('\n🎉 Database migration completed successfully!')
+
+        except Exception as e:
+            db.session.rollback()
+            print(f'❌ Migration failed: {e}')
+            return False
+
+    return True
+
+if __name__ == '__main__':
+    migrate_agreement_deposit_amounts()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Migration script to add lookup indexes to applications table
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.main import app
+from src.models.user import db
+from sqlalchemy import text
+
+def migrate_application_indexes():
+    """Add the (tenant_id, created_at) index used by tenant application lookups"""
+
+    with app.app_context():
+        try:
+            indexes = [
+                ("ix_applications_tenant_created", "applications (tenant_id, created_at)",
+                 "Tenant application lists and ownership checks")
+            ]
+
+            for index_name, definition, description in indexes:
+                db.session.execute(text(f'CREATE INDEX IF NOT EXISTS {index_name} ON {definition}'))
+                print(f'✅ Added {index_name} index - {description}')
+
+            db.session.commit()
+            print('\n🎉 Database migration completed successfully!')
+
+        except Exception as e:
+            db.session.rollback()
+            print(f'❌ Migration failed: {e}')
+            return False
+
+    return True
+
+if __name__ == '__main__':
+    migrate_application_indexes()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Migration script to enforce one deposit transaction per tenancy agreement
+(required by the deposit payment upsert)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.main import app
+from src.models.user import db
+from sqlalchemy import text
+
+def migrate_deposit_agreement_unique():
+    """Add a unique constraint on deposit_transactions.tenancy_agreement_id"""
+
+    with app.app_context():
+        try:
+            existing = db.session.execute(text(
+                "SELECT 1 FROM pg_constraint WHERE conname = 'uq_deposit_transaction_agreement'"
+            )).first()
+            if existing:
+                print('✅ uq_deposit_transaction_agreement already exists')
+                return True
+
+            duplicates = db.session.execute(text("""
+                SELECT tenancy_agreement_id, COUNT(*)
+                FROM deposit_transactions
+                GROUP BY tenancy_agreement_id
+                HAVING COUNT(*) > 1
+            """)).all()
+            if duplicates:
+                print('❌ Agreements with more than one deposit transaction must be resolved first:')
+                for agreement_id, count in duplicates:
+                    print(f'   agreement {agreement_id}: {count} deposits')
+                return False
+
+            db.session.execute(text("""
+                ALTER TABLE deposit_transactions
+                ADD CONSTRAINT uq_deposit_transaction_agreement UNIQUE (tenancy_agreement_id)
+            """))
+            db.session.commit()
+            print('✅ Added uq_deposit_transaction_agreement constraint')
+            print('\n🎉 Database migration completed successfully!')
+
+        except Exception as e:
+            db.session.rollback()
+            print(f'❌ Migration failed: {e}')
+            return False
+
+    return True
+
+if __name__ == '__main__':
+    migrate_deposit_agreement_unique()
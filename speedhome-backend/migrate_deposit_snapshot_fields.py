@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Migration script to add agreement snapshot fields to deposit_transactions table
+and backfill them from the linked tenancy agreements
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.main import app
+from src.models.user import db
+from sqlalchemy import text
+
+def migrate_deposit_snapshot_fields():
+    """Add and backfill property/tenant/landlord snapshot fields on deposit_transactions"""
+
+    with app.app_context():
+        try:
+            migrations = [
+                ("property_address_snapshot", "TEXT", "Property address copied from the agreement"),
+                ("tenant_name_snapshot", "VARCHAR(255)", "Tenant full name copied from the agreement"),
+                ("landlord_name_snapshot", "VARCHAR(255)", "Landlord full name copied from the agreement")
+            ]
+
+            for column_name, column_type, description in migrations:
+                db.session.execute(text(
+                    f'ALTER TABLE deposit_transactions ADD COLUMN IF NOT EXISTS {column_name} {column_type}'
+                ))
+                print(f'✅ Added {column_name} column - {description}')
+
+            # Backfill existing deposits from their tenancy agreements
+            result = db.session.execute(text("""
+                UPDATE deposit_transactions dt
+                SET property_address_snapshot = ta.property_address,
+                    tenant_name_snapshot = ta.tenant_full_name,
+                    landlord_name_snapshot = ta.landlord_full_name
+                FROM tenancy_agreements ta
+                WHERE ta.id = dt.tenancy_agreement_id
+                  AND dt.property_address_snapshot IS NULL
+            """))
+            print(f'✅ Backfilled snapshot fields for {result.rowcount} deposits')
+
+            db.session.commit()
+            print('\n🎉 Database migration completed successfully!')
+
+        except Exception as e:
+            db.session.rollback()
+            print(f'❌ Migration failed: {e}')
+            return False
+
+    return True
+
+if __name__ == '__main__':
+    migrate_deposit_snapshot_fields()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Migration script to add lookup indexes to messages and notifications tables
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.main import app
+from src.models.user import db
+from sqlalchemy import text
+
+def migrate_messaging_indexes():
+    """Add the unread-message, message-history and unread-notification indexes"""
+
+    with app.app_context():
+        try:
+            indexes = [
+                ("ix_messages_unread_conversation_sender", "messages (conversation_id, sender_id) WHERE is_read = false",
+                 "Unread message counts per conversation (partial index)"),
+                ("ix_messages_conversation_created", "messages (conversation_id, created_at)",
+                 "Conversation message history"),
+                ("ix_notifications_recipient_unread", "notifications (recipient_id, created_at) WHERE is_read = false",
+                 "Unread notification lists (partial index)")
+            ]
+
+            for index_name, definition, description in indexes:
+                db.session.execute(text(f'CREATE INDEX IF NOT EXISTS {index_name} ON {definition}'))
+                print(f'✅ Added {index_name} index - {description}')
+
+            db.session.commit()
+            print('\n🎉 Database migration completed successfully!')
+
+        except Exception as e:
+            db.session.rollback()
+            print(f'❌ Migration failed: {e}')
+            return False
+
+    return True
+
+if __name__ == '__main__':
+    migrate_messaging_indexes()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Migration script to move inline base64 profile pictures to the uploads
+directory and narrow users.profile_picture to a URL column
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.main import app
+from src.models.user import db
+from src.services.profile_picture_service import save_profile_picture
+from sqlalchemy import text
+
+def migrate_profile_pictures():
+    """Write base64 profile pictures to disk, store their URLs and alter the column to VARCHAR(512)"""
+
+    with app.app_context():
+        try:
+            rows = db.session.execute(text(
+                "SELECT id, profile_picture FROM users WHERE profile_picture LIKE 'data:%'"
+            )).all()
+
+            moved = cleared = 0
+            for user_id, data_uri in rows:
+                try:
+                    url = save_profile_picture(user_id, data_uri)
+                    moved += 1
+                except ValueError as e:
+                    # Unreadable images can't be kept in a URL column
+                    print(f'⚠️ Clearing profile picture for user {user_id}: {e}')
+                    url = None
+                    cleared += 1
+                db.session.execute(
+                    text('UPDATE users SET profile_picture = :url WHERE id = :id'),
+                    {'url': url, 'id': user_id}
+                )
+            print(f'✅ Moved {moved} profile pictures to storage ({cleared} cleared)')
+
+            db.session.execute(text(
+                'ALTER TABLE users ALTER COLUMN profile_picture TYPE VARCHAR(512)'
+            ))
+            print('✅ Changed profile_picture column to VARCHAR(512)')
+
+            db.session.commit()
+            print('\n🎉 Database migration completed successfully!')
+
+        except Exception as e:
+            db.session.rollback()
+            print(f'❌ Migration failed: {e}')
+            return False
+
+    return True
+
+if __name__ == '__main__':
+    migrate_profile_pictures()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Migration script to create the amenities and property_amenities tables and
+backfill them from the amenities JSON stored on each property
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.main import app
+from src.models.user import db
+from sqlalchemy import text
+
+def migrate_property_amenities():
+    """Create the normalized amenity tables and fill them from properties.amenities"""
+
+    with app.app_context():
+        try:
+            db.session.execute(text("""
+                CREATE TABLE IF NOT EXISTS amenities (
+                    id SERIAL PRIMARY KEY,
+                    name VARCHAR(100) NOT NULL UNIQUE
+                )
+            """))
+            print('✅ Created amenities table')
+
+            db.session.execute(text("""
+                CREATE TABLE IF NOT EXISTS property_amenities (
+                    property_id INTEGER NOT NULL REFERENCES properties(id) ON DELETE CASCADE,
+                    amenity_id INTEGER NOT NULL REFERENCES amenities(id) ON DELETE CASCADE,
+                    PRIMARY KEY (property_id, amenity_id)
+                )
+            """))
+            db.session.execute(text(
+                'CREATE INDEX IF NOT EXISTS ix_property_amenities_amenity ON property_amenities (amenity_id)'
+            ))
+            print('✅ Created property_amenities table')
+
+            # Backfill from the JSON arrays already stored on each property
+            result = db.session.execute(text("""
+                INSERT INTO amenities (name)
+                SELECT DISTINCT trim(e.name)
+                FROM properties p
+                CROSS JOIN LATERAL jsonb_array_elements_text(p.amenities::jsonb) AS e(name)
+                WHERE p.amenities IS NOT NULL AND trim(e.name) <> ''
+                ON CONFLICT (name) DO NOTHING
+            """))
+            print(f'✅ Added {result.rowcount} amenities')
+
+            result = db.session.execute(text("""
+                INSERT INTO property_amenities (property_id, amenity_id)
+                SELECT DISTINCT p.id, a.id
+                FROM properties p
+                CROSS JOIN LATERAL jsonb_array_elements_text(p.amenities::jsonb) AS e(name)
+                JOIN amenities a ON a.name = trim(e.name)
+                WHERE p.amenities IS NOT NULL
+                ON CONFLICT DO NOTHING
+            """))
+            print(f'✅ Linked {result.rowcount} property amenities')
+
+            db.session.commit()
+            print('\n🎉 Database migration completed successfully!')
+
+        except Exception as e:
+            db.session.rollback()
+            print(f'❌ Migration failed: {e}')
+            return False
+
+    return True
+
+if __name__ == '__main__':
+    migrate_property_amenities()
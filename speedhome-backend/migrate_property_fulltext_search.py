@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Migration script to add a full-text search column and index to the properties table
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.main import app
+from src.models.user import db
+from sqlalchemy import text
+
+def migrate_property_fulltext_search():
+    """Add the generated search_vector tsvector column and its GIN index"""
+
+    with app.app_context():
+        try:
+            db.session.execute(text("""
+                ALTER TABLE properties
+                ADD COLUMN IF NOT EXISTS search_vector tsvector
+                GENERATED ALWAYS AS (
+                    to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, '') || ' ' || coalesce(location, ''))
+                ) STORED
+            """))
+            print('✅ Added search_vector column to properties table')
+
+            db.session.execute(text(
+                'CREATE INDEX IF NOT EXISTS ix_properties_search_vector ON properties USING gin (search_vector)'
+            ))
+            print('✅ Added ix_properties_search_vector index - Full-text property search')
+
+            db.session.commit()
+            print('\n🎉 Database migration completed successfully!')
+
+        except Exception as e:
+            db.session.rollback()
+            print(f'❌ Migration failed: {e}')
+            return False
+
+    return True
+
+if __name__ == '__main__':
+    migrate_property_fulltext_search()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Migration script to add listing and search filter indexes to properties table
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.main import app
+from src.models.user import db
+from sqlalchemy import text
+
+def migrate_property_indexes():
+    """Add the status/owner listing indexes and the search filter indexes"""
+
+    with app.app_context():
+        try:
+            indexes = [
+                ("ix_properties_status_date_added", "properties (status, date_added)",
+                 "Public listings by status, newest first"),
+                ("ix_properties_owner_date_added", "properties (owner_id, date_added)",
+                 "Landlord listings, newest first"),
+                ("ix_properties_price", "properties (price)", "Price range filter"),
+                ("ix_properties_bedrooms", "properties (bedrooms)", "Bedrooms filter"),
+                ("ix_properties_bathrooms", "properties (bathrooms)", "Bathrooms filter"),
+                ("ix_properties_property_type", "properties (property_type)", "Property type filter"),
+                ("ix_properties_furnished", "properties (furnished)", "Furnished filter")
+            ]
+
+            for index_name, definition, description in indexes:
+                db.session.execute(text(f'CREATE INDEX IF NOT EXISTS {index_name} ON {definition}'))
+                print(f'✅ Added {index_name} index - {description}')
+
+            db.session.commit()
+            print('\n🎉 Database migration completed successfully!')
+
+        except Exception as e:
+            db.session.rollback()
+            print(f'❌ Migration failed: {e}')
+            return False
+
+    return True
+
+if __name__ == '__main__':
+    migrate_property_indexes()
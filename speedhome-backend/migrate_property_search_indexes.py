@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the trigram index for location search on properties table
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.main import app
+from src.models.user import db
+from sqlalchemy import text
+
+def migrate_property_search_indexes():
+    """Enable pg_trgm and add a GIN trigram index on location"""
+
+    with app.app_context():
+        try:
+            db.session.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+            print('✅ Enabled pg_trgm extension')
+
+            indexes = [
+                ("ix_properties_location_trgm", "properties USING gin (location gin_trgm_ops)",
+                 "Location search (ILIKE '%term%')")
+            ]
+
+            for index_name, definition, description in indexes:
+                db.session.execute(text(f'CREATE INDEX IF NOT EXISTS {index_name} ON {definition}'))
+                print(f'✅ Added {index_name} index - {description}')
+
+            # ?q= searches use the search_vector full-text index instead
+            # (migrate_property_fulltext_search.py); these only slowed down writes
+            for index_name in ('ix_properties_title_trgm', 'ix_properties_description_trgm'):
+                db.session.execute(text(f'DROP INDEX IF EXISTS {index_name}'))
+                print(f'✅ Dropped unused {index_name} index')
+
+            db.session.commit()
+            print('\n🎉 Database migration completed successfully!')
+
+        except Exception as e:
+            db.session.rollback()
+            print(f'❌ Migration failed: {e}')
+            return False
+
+    return True
+
+if __name__ == '__main__':
+    migrate_property_search_indexes()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Migration script to add lookup indexes to tenancy_agreements table
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.main import app
+from src.models.user import db
+from sqlalchemy import text
+
+def migrate_tenancy_agreement_indexes():
+    """Add the (tenant_id, status) index used by tenant agreement lookups"""
+
+    with app.app_context():
+        try:
+            indexes = [
+                ("ix_tenancy_agreements_tenant_status", "tenancy_agreements (tenant_id, status)",
+                 "Tenant agreement lists and active-agreement lookups")
+            ]
+
+            for index_name, definition, description in indexes:
+                db.session.execute(text(f'CREATE INDEX IF NOT EXISTS {index_name} ON {definition}'))
+                print(f'✅ Added {index_name} index - {description}')
+
+            db.session.commit()
+            print('\n🎉 Database migration completed successfully!')
+
+        except Exception as e:
+            db.session.rollback()
+            print(f'❌ Migration failed: {e}')
+            return False
+
+    return True
+
+if __name__ == '__main__':
+    migrate_tenancy_agreement_indexes()
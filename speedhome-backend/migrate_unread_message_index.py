@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Migration script to replace the full unread-message index on messages with a
+partial index over unread rows only
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.main import app
+from src.models.user import db
+from sqlalchemy import text
+
+def migrate_unread_message_index():
+    """Create the partial unread-message index and drop the full one it replaces"""
+
+    with app.app_context():
+        try:
+            db.session.execute(text(
+                'CREATE INDEX IF NOT EXISTS ix_messages_unread_conversation_sender '
+                'ON messages (conversation_id, sender_id) WHERE is_read = false'
+            ))
+            print('✅ Added ix_messages_unread_conversation_sender index - Unread messages per conversation (partial index)')
+
+            db.session.execute(text('DROP INDEX IF EXISTS ix_messages_conversation_read_sender'))
+            print('✅ Dropped ix_messages_conversation_read_sender index - Replaced by the partial index')
+
+            db.session.commit()
+            print('\n🎉 Database migration completed successfully!')
+
+        except Exception as e:
+            db.session.rollback()
+            print(f'❌ Migration failed: {e}')
+            return False
+
+    return True
+
+if __name__ == '__main__':
+    migrate_unread_message_index()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the available slot index to viewing_slots table
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.main import app
+from src.models.user import db
+from sqlalchemy import text
+
+def migrate_viewing_slot_indexes():
+    """Add the available slot index"""
+
+    with app.app_context():
+        try:
+            # The landlord calendar is served by uq_viewing_slot_landlord_start
+            # (see migrate_viewing_slot_unique.py)
+            indexes = [
+                ("ix_viewing_slots_landlord_available_date",
+                 "viewing_slots (landlord_id, is_available, date, start_time)",
+                 "Available slots for tenants, in display order")
+            ]
+
+            for index_name, definition, description in indexes:
+                db.session.execute(text(f'CREATE INDEX IF NOT EXISTS {index_name} ON {definition}'))
+                print(f'✅ Added {index_name} index - {description}')
+
+            db.session.commit()
+            print('\n🎉 Database migration completed successfully!')
+
+        except Exception as e:
+            db.session.rollback()
+            print(f'❌ Migration failed: {e}')
+            return False
+
+    return True
+
+if __name__ == '__main__':
+    migrate_viewing_slot_indexes()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Migration script to enforce one viewing slot per landlord start time
+(required by the recurring availability ON CONFLICT DO NOTHING insert)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.main import app
+from src.models.user import db
+from sqlalchemy import text
+
+def migrate_viewing_slot_unique():
+    """Add a unique constraint on viewing_slots (landlord_id, date, start_time)"""
+
+    with app.app_context():
+        try:
+            existing = db.session.execute(text(
+                "SELECT 1 FROM pg_constraint WHERE conname = 'uq_viewing_slot_landlord_start'"
+            )).first()
+            if existing:
+                print('✅ uq_viewing_slot_landlord_start already exists')
+                return True
+
+            # Re-applying a schedule used to add an open slot next to each booked
+            # one; drop open duplicates that no booking points at
+            removed = db.session.execute(text("""
+                DELETE FROM viewing_slots v
+                USING viewing_slots other
+                WHERE v.landlord_id = other.landlord_id
+                  AND v.date = other.date
+                  AND v.start_time = other.start_time
+                  AND v.is_available
+                  AND (NOT other.is_available OR other.id < v.id)
+                  AND NOT EXISTS (SELECT 1 FROM bookings b WHERE b.viewing_slot_id = v.id)
+            """)).rowcount
+            print(f'✅ Removed {removed} duplicate open viewing slots')
+
+            duplicates = db.session.execute(text("""
+                SELECT landlord_id, date, start_time, COUNT(*)
+                FROM viewing_slots
+                GROUP BY landlord_id, date, start_time
+                HAVING COUNT(*) > 1
+            """)).all()
+            if duplicates:
+                db.session.rollback()
+                print('❌ Booked duplicate viewing slots must be resolved first:')
+                for landlord_id, slot_date, start_time, count in duplicates:
+                    print(f'   landlord {landlord_id} on {slot_date} at {start_time}: {count} slots')
+                return False
+
+            db.session.execute(text("""
+                ALTER TABLE viewing_slots
+                ADD CONSTRAINT uq_viewing_slot_landlord_start UNIQUE (landlord_id, date, start_time)
+            """))
+            # The constraint's index covers the same columns
+            db.session.execute(text('DROP INDEX IF EXISTS ix_viewing_slots_landlord_date'))
+            db.session.commit()
+            print('✅ Added uq_viewing_slot_landlord_start constraint')
+            print('\n🎉 Database migration completed successfully!')
+
+        except Exception as e:
+            db.session.rollback()
+            print(f'❌ Migration failed: {e}')
+            return False
+
+    return True
+
+if __name__ == '__main__':
+    migrate_viewing_slot_unique()
@@ -11,6 +11,7 @@ from datetime import timedelta
 from flask_migrate import Migrate
 from src.models.user import db, User
 from src.models.property import Property
+from src.models.amenity import Amenity, PropertyAmenity
 from src.models.booking import Booking
 from src.models.application import Application
 from src.models.tenancy_agreement import TenancyAgreement
@@ -18,6 +19,8 @@ from src.models.notification import Notification
 from src.models.viewing_slot import ViewingSlot
 from src.models.conversation import Conversation
 from src.models.message import Message
+from src.json_provider import OrJSONProvider
+from src.query_counter import init_query_counter
 
 from src.routes.property import property_bp
 from src.routes.property_landlord import landlord_bp
@@ -42,11 +45,20 @@ from src.admin.admin_config import init_admin
 from src.admin.auth import admin_auth_bp
 
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+app.json = OrJSONProvider(app)
 
 # --- CONFIGURATION ---
 app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=7)
 
+# Let the front-end server stream uploaded application documents instead of the
+# worker. X_ACCEL_REDIRECT_PREFIX is nginx's internal location for the backend
+# root (e.g. /protected maps /protected/uploads/ to the uploads directory) and
+# only affects the document download route; USE_X_SENDFILE covers Apache/lighttpd
+# and applies to every send_file response.
+app.config['X_ACCEL_REDIRECT_PREFIX'] = os.environ.get('X_ACCEL_REDIRECT_PREFIX')
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE', 'false').lower() == 'true'
+
 # Stripe configuration (from environment variables)
 app.config['STRIPE_SECRET_KEY'] = os.environ.get('STRIPE_SECRET_KEY', 'sk_test_default')
 app.config['STRIPE_PUBLISHABLE_KEY'] = os.environ.get('STRIPE_PUBLISHABLE_KEY', 'pk_test_default')
@@ -83,8 +95,23 @@ if not database_url:
 
 app.config['SQLALCHEMY_DATABASE_URI'] = database_url
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Connection pool sized for bursts of payment requests; pre-ping and recycle
+# drop connections the database has closed while they sat idle in the pool,
+# and the short timeout fails a request fast instead of queueing behind a full pool.
+# Bulk inserts (e.g. recurring viewing slots) are sent 1000 rows per statement
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_size': int(os.environ.get('DB_POOL_SIZE', 20)),
+    'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 40)),
+    'pool_pre_ping': True,
+    'pool_recycle': 1800,
+    'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 5)),
+    'insertmanyvalues_page_size': 1000,
+}
 db.init_app(app)
 
+# Report per-request query counts in debug mode (X-Query-Count header)
+init_query_counter(app, db)
+
 migrate = Migrate(app, db)
 
 # Initialize Flask-Admin
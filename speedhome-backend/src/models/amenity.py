@@ -0,0 +1,42 @@
+from sqlalchemy.dialects.postgresql import insert
+from .user import db
+
+
+class Amenity(db.Model):
+    """An amenity name shared by all properties that offer it"""
+    __tablename__ = 'amenities'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False, unique=True)
+
+    def __repr__(self):
+        return f'<Amenity {self.name}>'
+
+    @classmethod
+    def get_or_create_many(cls, names):
+        """
+        Return the Amenity rows for the given names, creating any that are missing.
+
+        Missing names are inserted with ON CONFLICT DO NOTHING so concurrent
+        listings adding the same new amenity don't collide.
+        """
+        names = list(dict.fromkeys(n.strip() for n in names if isinstance(n, str) and n.strip()))
+        if not names:
+            return []
+
+        db.session.execute(
+            insert(cls).values([{'name': name} for name in names]).on_conflict_do_nothing(index_elements=['name'])
+        )
+        return cls.query.filter(cls.name.in_(names)).all()
+
+
+class PropertyAmenity(db.Model):
+    """Link between a property and one of its amenities"""
+    __tablename__ = 'property_amenities'
+    __table_args__ = (
+        # Amenity filters look up properties by amenity
+        db.Index('ix_property_amenities_amenity', 'amenity_id'),
+    )
+
+    property_id = db.Column(db.Integer, db.ForeignKey('properties.id', ondelete='CASCADE'), primary_key=True)
+    amenity_id = db.Column(db.Integer, db.ForeignKey('amenities.id', ondelete='CASCADE'), primary_key=True)
@@ -6,6 +6,10 @@ from datetime import datetime
 
 class Application(db.Model):
     __tablename__ = 'applications'
+    __table_args__ = (
+        # Tenant application lists (newest first) and tenant ownership checks
+        db.Index('ix_applications_tenant_created', 'tenant_id', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     status = db.Column(db.String(50), nullable=False, default='pending') # pending, approved, rejected
@@ -41,8 +41,15 @@ class Conversation(db.Model):
     def __repr__(self):
         return f'<Conversation {self.id} - Tenant:{self.tenant_id} Landlord:{self.landlord_id} Booking:{self.booking_id}>'
 
-    def to_dict(self):
-        """Convert conversation to dictionary for API responses"""
+    def to_dict(self, message_count=None):
+        """
+        Convert conversation to dictionary for API responses
+
+        Pass message_count when it is already known to avoid loading the messages
+        """
+        if message_count is None:
+            message_count = len(self.messages) if self.messages else 0
+
         return {
             'id': self.id,
             'tenant_id': self.tenant_id,
@@ -61,7 +68,7 @@ class Conversation(db.Model):
             'tenant_name': f"{self.tenant.first_name} {self.tenant.last_name}" if self.tenant else None,
             'landlord_name': f"{self.landlord.first_name} {self.landlord.last_name}" if self.landlord else None,
             'property_title': self.property.title if self.property else None,
-            'message_count': len(self.messages) if self.messages else 0
+            'message_count': message_count
         }
 
     def can_send_message(self, user_id, booking_status):
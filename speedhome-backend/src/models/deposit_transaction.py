@@ -14,6 +14,8 @@ class DepositTransactionStatus(Enum):
 
 class DepositTransaction(db.Model):
     __tablename__ = 'deposit_transactions'
+    __table_args__ = (
+    db.UniqueConstraint('tenancy_agreement_id', name='uq_deposit_transaction_agreement'),)
     
     id = db.Column(db.Integer, primary_key=True)
     
@@ -48,12 +50,18 @@ class DepositTransaction(db.Model):
     released_at = db.Column(db.DateTime, nullable=True)
     refunded_at = db.Column(db.DateTime, nullable=True)
     
+    # Display details (snapshot of the tenancy agreement at deposit creation)
+    property_address_snapshot = db.Column(db.Text, nullable=True)
+    tenant_name_snapshot = db.Column(db.String(255), nullable=True)
+    landlord_name_snapshot = db.Column(db.String(255), nullable=True)
+    
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships with existing models (using string references to avoid import issues)
-    tenancy_agreement = db.relationship('TenancyAgreement', backref='deposit_transaction', lazy=True)
+    # One deposit per agreement (uq_deposit_transaction_agreement), so the backref is scalar
+    tenancy_agreement = db.relationship('TenancyAgreement', backref=db.backref('deposit_transaction', uselist=False), lazy=True)
     property = db.relationship('Property', backref='deposit_transactions', lazy=True)
     tenant = db.relationship('User', foreign_keys=[tenant_id], backref='tenant_deposits', lazy=True)
     landlord = db.relationship('User', foreign_keys=[landlord_id], backref='landlord_deposits', lazy=True)
@@ -154,6 +162,39 @@ class DepositTransaction(db.Model):
         
         return final_amount, adjustments
     
+    @staticmethod
+    def agreement_snapshot_values(agreement):
+        """Snapshot column values for an agreement, for use in Core inserts"""
+        return {
+            'property_address_snapshot': agreement.property_address,
+            'tenant_name_snapshot': agreement.tenant_full_name,
+            'landlord_name_snapshot': agreement.landlord_full_name
+        }
+    
+    def snapshot_agreement_details(self, agreement):
+        """Copy display details from the tenancy agreement so reads can skip the join"""
+        for column, value in self.agreement_snapshot_values(agreement).items():
+            setattr(self, column, value)
+    
+    def get_agreement_details(self):
+        """Get property address and party names, falling back to the agreement for older rows"""
+        if self.property_address_snapshot is not None:
+            return {
+                'property_address': self.property_address_snapshot,
+                'tenant_name': self.tenant_name_snapshot,
+                'landlord_name': self.landlord_name_snapshot
+            }
+        
+        agreement = self.tenancy_agreement
+        if not agreement:
+            return None
+        
+        return {
+            'property_address': agreement.property_address,
+            'tenant_name': agreement.tenant_full_name,
+            'landlord_name': agreement.landlord_full_name
+        }
+    
     def mark_as_paid(self, payment_intent_id, payment_method):
         """Mark deposit as paid and update status"""
         self.status = DepositTransactionStatus.PAID
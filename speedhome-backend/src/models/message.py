@@ -3,6 +3,13 @@ from .user import db
 
 class Message(db.Model):
     __tablename__ = 'messages'
+    __table_args__ = (
+        # Unread counts and mark-as-read; partial, so it only holds the few unread rows
+        db.Index('ix_messages_unread_conversation_sender', 'conversation_id', 'sender_id',
+                 postgresql_where=db.text('is_read = false')),
+        # Conversation history in order
+        db.Index('ix_messages_conversation_created', 'conversation_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     
@@ -32,6 +32,12 @@ class NotificationPriority(Enum):
 
 class Notification(db.Model):
     __tablename__ = 'notifications'
+    __table_args__ = (
+        # Unread notification list per user, newest first; partial so it only
+        # holds the (small) unread set
+        db.Index('ix_notifications_recipient_unread', 'recipient_id', 'created_at',
+                 postgresql_where=db.text('is_read = false')),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     recipient_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
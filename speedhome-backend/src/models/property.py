@@ -2,11 +2,15 @@ from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime, date
 import json
 import enum
+from sqlalchemy import DDL, event
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 
 # Import db from user model to ensure single instance
 from .user import db
 
 from .booking import Booking
+from .amenity import Amenity
 
 class PropertyStatus(enum.Enum):
     """Property status enum for lifecycle management"""
@@ -17,6 +21,23 @@ class PropertyStatus(enum.Enum):
 
 class Property(db.Model):
     __tablename__ = 'properties'
+    __table_args__ = (
+        # Public listings: status filter, newest first
+        db.Index('ix_properties_status_date_added', 'status', 'date_added'),
+        # Landlord listings, newest first
+        db.Index('ix_properties_owner_date_added', 'owner_id', 'date_added'),
+        # Search filters
+        db.Index('ix_properties_price', 'price'),
+        db.Index('ix_properties_bedrooms', 'bedrooms'),
+        db.Index('ix_properties_bathrooms', 'bathrooms'),
+        db.Index('ix_properties_property_type', 'property_type'),
+        db.Index('ix_properties_furnished', 'furnished'),
+        # Trigram index so the location ILIKE '%term%' filter avoids a sequential scan (needs pg_trgm)
+        db.Index('ix_properties_location_trgm', 'location',
+                 postgresql_using='gin', postgresql_ops={'location': 'gin_trgm_ops'}),
+        # Full-text search over title, description and location (the ?q= search)
+        db.Index('ix_properties_search_vector', 'search_vector', postgresql_using='gin'),
+    )
     
     # Primary key
     id = db.Column(db.Integer, primary_key=True)
@@ -36,6 +57,17 @@ class Property(db.Model):
     furnished = db.Column(db.String(50), nullable=False, default='Unfurnished')
     description = db.Column(db.Text, nullable=True)
     
+    # Full-text search document, kept up to date by PostgreSQL; deferred so
+    # listings never load it
+    search_vector = deferred(db.Column(
+        TSVECTOR,
+        db.Computed(
+            "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, '') || ' ' || coalesce(location, ''))",
+            persisted=True
+        ),
+        nullable=True
+    ))
+    
     # Property status and metrics
     status = db.Column(db.Enum(PropertyStatus), nullable=False, default=PropertyStatus.ACTIVE)
     available_from_date = db.Column(db.Date, nullable=True)  # For future availability when re-listing
@@ -75,6 +107,8 @@ class Property(db.Model):
     
     # Relationships
     bookings = db.relationship('Booking', backref='property', lazy=True, cascade="all, delete-orphan")
+    # Normalized copy of the amenities JSON, used for amenity filters
+    amenity_records = db.relationship('Amenity', secondary='property_amenities', lazy=True)
 
     def __repr__(self):
         return f'<Property {self.title}>'
@@ -183,7 +217,7 @@ class Property(db.Model):
         property_obj.hot_property = bool(data.get('hotProperty', False))
         
         # Amenities and tags
-        property_obj.amenities = json.dumps(data.get('amenities', [])) if data.get('amenities') else None
+        property_obj.set_amenities(data.get('amenities'))
         property_obj.tags = json.dumps(data.get('tags', [])) if data.get('tags') else None
         
         # Ownership
@@ -236,7 +270,6 @@ class Property(db.Model):
             available_from = data['available_from_date']
             if available_from:
                 if isinstance(available_from, str):
-                    from datetime import datetime
                     self.available_from_date = datetime.fromisoformat(available_from).date()
                 elif isinstance(available_from, date):
                     self.available_from_date = available_from
@@ -282,13 +315,18 @@ class Property(db.Model):
         
         # Amenities and tags
         if 'amenities' in data:
-            self.amenities = json.dumps(data['amenities']) if data['amenities'] else None
+            self.set_amenities(data['amenities'])
         if 'tags' in data:
             self.tags = json.dumps(data['tags']) if data['tags'] else None
         
         # Update timestamp
         self.date_updated = datetime.utcnow()
 
+    def set_amenities(self, amenities):
+        """Store the amenities list and keep the property_amenities links in sync"""
+        self.amenities = json.dumps(amenities) if amenities else None
+        self.amenity_records = Amenity.get_or_create_many(amenities or [])
+
     # Status management methods for property lifecycle
     def can_transition_to(self, new_status):
         """Check if property can transition to the given status"""
@@ -355,4 +393,9 @@ class Property(db.Model):
         return self.status.value if self.status else 'Active'
 
 
-
+# The trigram index needs the pg_trgm extension when tables are created with create_all()
+event.listen(
+    Property.__table__,
+    'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+)
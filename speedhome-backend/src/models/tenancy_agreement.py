@@ -1,9 +1,31 @@
 from .user import db
 from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+
+
+def calculate_deposit_amounts(monthly_rent):
+    """(security, utility, total) deposit for a monthly rent: 2 months + 0.5 month, rounded to sen"""
+    monthly_rent = Decimal(str(monthly_rent or 0))
+    cent = Decimal('0.01')
+    security = (monthly_rent * 2).quantize(cent, rounding=ROUND_HALF_UP)
+    utility = (monthly_rent * Decimal('0.5')).quantize(cent, rounding=ROUND_HALF_UP)
+    return security, utility, security + utility
+
+
+def deposit_amounts(agreement):
+    """
+    Stored (security, utility, total) deposit for an agreement or a Core row
+    with the same columns; computed for agreements created before they were stored
+    """
+    if agreement.total_deposit is None:
+        return calculate_deposit_amounts(agreement.monthly_rent)
+    return agreement.security_deposit, agreement.utility_deposit, agreement.total_deposit
 
 
 class TenancyAgreement(db.Model):
     __tablename__ = 'tenancy_agreements'
+    __table_args__ = (
+    db.Index('ix_tenancy_agreements_tenant_status', 'tenant_id', 'status'),)
 
     id = db.Column(db.Integer, primary_key=True)
     
@@ -36,6 +58,8 @@ class TenancyAgreement(db.Model):
     # Agreement Terms (copied from application and property at time of creation)
     monthly_rent = db.Column(db.Numeric(10, 2), nullable=False)
     security_deposit = db.Column(db.Numeric(10, 2), nullable=True)
+    utility_deposit = db.Column(db.Numeric(10, 2), nullable=True)  # 0.5 month, stored with security_deposit
+    total_deposit = db.Column(db.Numeric(10, 2), nullable=True)    # security + utility deposit
     lease_start_date = db.Column(db.Date, nullable=False)
     lease_end_date = db.Column(db.Date, nullable=False)
     lease_duration_months = db.Column(db.Integer, nullable=False)
@@ -152,6 +176,19 @@ class TenancyAgreement(db.Model):
         """Check if withdrawal window is closed (both parties signed)"""
         return self.is_fully_signed
 
+    def set_deposit_amounts(self):
+        """Store the standard deposit (2 months security + 0.5 month utility) from monthly_rent"""
+        self.security_deposit, self.utility_deposit, self.total_deposit = calculate_deposit_amounts(self.monthly_rent)
+
+    def get_deposit_amounts(self):
+        """Return (security, utility, total) deposit, computing them for agreements created before they were stored"""
+        return deposit_amounts(self)
+
+    # Relationships (declared after the @property helpers so 'property' does not shadow the builtin)
+    property = db.relationship('Property', foreign_keys=[property_id], backref='tenancy_agreements', lazy=True)
+    tenant = db.relationship('User', foreign_keys=[tenant_id], backref='tenant_agreements', lazy=True)
+    landlord = db.relationship('User', foreign_keys=[landlord_id], backref='landlord_agreements', lazy=True)
+
     def to_dict(self):
         """Serialize the agreement to a dictionary"""
         return {
@@ -181,6 +218,8 @@ class TenancyAgreement(db.Model):
             # Agreement terms
             'monthly_rent': float(self.monthly_rent) if self.monthly_rent else None,
             'security_deposit': float(self.security_deposit) if self.security_deposit else None,
+            'utility_deposit': float(self.utility_deposit) if self.utility_deposit else None,
+            'total_deposit': float(self.total_deposit) if self.total_deposit else None,
             'lease_start_date': self.lease_start_date.isoformat() if self.lease_start_date else None,
             'lease_end_date': self.lease_end_date.isoformat() if self.lease_end_date else None,
             'lease_duration_months': self.lease_duration_months,
@@ -241,7 +280,7 @@ class TenancyAgreement(db.Model):
         if not self.deposit_transaction:
             return None
             
-        deposit = self.deposit_transaction[0]
+        deposit = self.deposit_transaction
         deposit_data = deposit.to_dict()
         
         # Add tenancy status
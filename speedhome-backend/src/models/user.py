@@ -19,7 +19,7 @@ class User(UserMixin, db.Model):
     first_name = db.Column(db.String(50), nullable=True)
     last_name = db.Column(db.String(50), nullable=True)
     phone = db.Column(db.String(20), nullable=True)
-    profile_picture = db.Column(db.Text, nullable=True)  # Base64 or URL
+    profile_picture = db.Column(db.String(512), nullable=True)  # Image URL
     bio = db.Column(db.Text, nullable=True)
     occupation = db.Column(db.String(100), nullable=True)
     company_name = db.Column(db.String(100), nullable=True)
@@ -1,12 +1,32 @@
-from datetime import datetime, date, time
+from datetime import datetime, date, time, timedelta
 from sqlalchemy import Column, Integer, String, DateTime, Date, Time, Boolean, ForeignKey
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import relationship
 from .user import db
 from .property import Property
 
+# Schedule day names sent by the availability calendar -> Python weekday()
+DAY_MAPPING = {
+    'sunday': 6, 'monday': 0, 'tuesday': 1, 'wednesday': 2,
+    'thursday': 3, 'friday': 4, 'saturday': 5
+}
+
+# Longest date range a single recurring availability request may fill
+MAX_AVAILABILITY_DAYS = 365
+
+# Length of each slot generated from a recurring schedule
+SLOT_LENGTH = timedelta(minutes=30)
+
 class ViewingSlot(db.Model):
     """Model for individual viewing time slots - landlord-based"""
     __tablename__ = 'viewing_slots'
+    __table_args__ = (
+        # One slot per landlord start time; its index also serves the landlord
+        # calendar and range clears, ordered by date and time
+        db.UniqueConstraint('landlord_id', 'date', 'start_time', name='uq_viewing_slot_landlord_start'),
+        # Open slots offered to tenants, already in display order
+        db.Index('ix_viewing_slots_landlord_available_date', 'landlord_id', 'is_available', 'date', 'start_time'),
+    )
     
     id = Column(Integer, primary_key=True)
     landlord_id = Column(Integer, ForeignKey('users.id'), nullable=False)  # Changed from property_id to landlord_id
@@ -41,3 +61,65 @@ class ViewingSlot(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+    @staticmethod
+    def schedule_by_weekday(schedule):
+        """
+        Turn a {'Monday': {'from': '09:00', 'to': '17:00'}, ...} schedule into
+        {weekday: (from_time, to_time)}.
+
+        Unknown day names, malformed times and empty ranges are dropped; if a
+        weekday appears twice the first entry wins.
+        """
+        by_weekday = {}
+        for day_name, day_config in schedule.items():
+            weekday = DAY_MAPPING.get(str(day_name).lower())
+            if weekday is None or weekday in by_weekday:
+                continue
+            try:
+                from_time = datetime.strptime(day_config['from'], '%H:%M').time()
+                to_time = datetime.strptime(day_config['to'], '%H:%M').time()
+            except (ValueError, KeyError, TypeError):
+                continue
+            if to_time > from_time:
+                by_weekday[weekday] = (from_time, to_time)
+        return by_weekday
+
+    @classmethod
+    def create_schedule_slots(cls, landlord_id, start_date, end_date, schedule_by_weekday):
+        """
+        Insert open 30-minute slots for every scheduled day from start_date to
+        end_date and return how many were created.
+
+        Start times the landlord already has a slot for (e.g. booked slots kept
+        by a range clear) are skipped by the database via ON CONFLICT DO NOTHING,
+        so no existence check is needed up front.
+        """
+        rows = []
+        current_date = start_date
+        while current_date <= end_date:
+            day_hours = schedule_by_weekday.get(current_date.weekday())
+            if day_hours:
+                slot_start = datetime.combine(current_date, day_hours[0])
+                day_end = datetime.combine(current_date, day_hours[1])
+                while slot_start + SLOT_LENGTH <= day_end:
+                    rows.append({
+                        'landlord_id': landlord_id,
+                        'date': current_date,
+                        'start_time': slot_start.time(),
+                        'end_time': (slot_start + SLOT_LENGTH).time(),
+                        'is_available': True
+                    })
+                    slot_start += SLOT_LENGTH
+            current_date += timedelta(days=1)
+
+        if not rows:
+            return 0
+
+        # One executemany; RETURNING counts the inserted rows across all batches
+        result = db.session.execute(
+            insert(cls).on_conflict_do_nothing(
+                index_elements=['landlord_id', 'date', 'start_time']
+            ).returning(cls.id),
+            rows
+        )
+        return len(result.all())
@@ -0,0 +1,54 @@
+"""
+Query Counter
+Counts SQL statements per request in debug mode so N+1 query patterns show up
+"""
+
+import logging
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.orm import raiseload
+
+logger = logging.getLogger(__name__)
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    # Background threads have no request context and are not counted
+    if has_request_context() and '_query_count' in g:
+        g._query_count += 1
+
+
+def init_query_counter(app, db, warn_threshold=10):
+    """
+    Report the number of SQL statements each request ran while app.debug is on.
+
+    The count is returned in an X-Query-Count header and requests above
+    warn_threshold are logged, giving a per-endpoint baseline for spotting
+    lazy loads inside loops.
+    """
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', _count_query)
+
+    @app.before_request
+    def _start_query_count():
+        if app.debug:
+            g._query_count = 0
+
+    @app.after_request
+    def _report_query_count(response):
+        if app.debug and '_query_count' in g:
+            response.headers['X-Query-Count'] = str(g._query_count)
+            if g._query_count > warn_threshold:
+                logger.warning(f"{request.method} {request.path} ran {g._query_count} queries")
+        return response
+
+
+def strict_loading():
+    """
+    Query options that make any relationship not loaded up front raise in debug mode.
+
+    Add to a query alongside its eager loads, e.g.
+    query.options(joinedload(Model.rel), *strict_loading()); production keeps
+    plain lazy loading so a missed eager load only costs a query.
+    """
+    return (raiseload('*'),) if current_app.debug else ()
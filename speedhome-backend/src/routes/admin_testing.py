@@ -121,7 +121,7 @@ def create_test_expired_tenancy():
             }), 400
             
         # Get the property
-        property_obj = Property.query.get(property_id)
+        property_obj = db.session.get(Property, property_id)
         if not property_obj:
             return jsonify({
                 "success": False,
@@ -215,7 +215,7 @@ def get_property_status_info(property_id):
     Get detailed property status information for testing
     """
     try:
-        property_obj = Property.query.get(property_id)
+        property_obj = db.session.get(Property, property_id)
         if not property_obj:
             return jsonify({
                 "success": False,
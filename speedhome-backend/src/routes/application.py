@@ -44,7 +44,7 @@ def submit_application():
         if not property_id:
             return jsonify({'success': False, 'error': 'Property ID is required'}), 400
             
-        prop = Property.query.get(property_id)
+        prop = db.session.get(Property, property_id)
         if not prop:
             return jsonify({'success': False, 'error': 'Property not found'}), 404
 
@@ -350,7 +350,7 @@ def update_application_status(application_id):
 
     app.status = new_status
 
-    prop = Property.query.get(app.property_id)
+    prop = db.session.get(Property, app.property_id)
 
     # Create a notification for the tenant whose application status changed
     tenant_notification = Notification(
@@ -426,7 +426,6 @@ def update_application_status(application_id):
                 monthly_rent=prop.price,
                 # TODO: At some point review this so we can possibly have a dynamic calculation based on property size/rent or whatever
                 payment_required=399.00,
-                security_deposit=prop.price * 2,  # Example: 2 months rent
                 lease_start_date=app.move_in_date,
                 lease_end_date=lease_end,
                 lease_duration_months=months,
@@ -443,6 +442,7 @@ def update_application_status(application_id):
                 landlord_email=landlord.email,
                 expires_at=datetime.now(timezone.utc) + timedelta(hours=48)
             )
+            new_agreement.set_deposit_amounts()
             db.session.add(new_agreement)
             db.session.commit()  # Commit here to get the new_agreement.id
 
@@ -1,5 +1,5 @@
 from flask import Blueprint, request, jsonify, session
-from datetime import datetime, date, time, timedelta
+from datetime import datetime, date, time
 
 from sqlalchemy.orm import joinedload
 
@@ -27,7 +27,7 @@ def create_booking():
         data = request.get_json()
         property_id = data.get('property_id')
 
-        property_obj = Property.query.get(property_id)
+        property_obj = db.session.get(Property, property_id)
         if not property_obj:
             return jsonify({'success': False, 'error': 'Property not found'}), 404
 
@@ -94,7 +94,7 @@ def cancel_booking_by_tenant(booking_id):
 
         # ✅ FIX: Release the viewing slot back to availability when booking is cancelled
         if booking.viewing_slot_id:
-            viewing_slot = ViewingSlot.query.get(booking.viewing_slot_id)
+            viewing_slot = db.session.get(ViewingSlot, booking.viewing_slot_id)
             if viewing_slot:
                 viewing_slot.is_available = True
                 viewing_slot.booked_by_user_id = None
@@ -178,7 +178,7 @@ def get_bookings_by_landlord(landlord_id):
         for booking in bookings:
             booking_dict = booking.to_dict()
 
-            property_obj = Property.query.get(booking.property_id)
+            property_obj = db.session.get(Property, booking.property_id)
             if property_obj:
                 booking_dict['property'] = {
                     'id': property_obj.id,
@@ -224,7 +224,7 @@ def update_booking_status(booking_id):
         if not booking:
             return jsonify({'success': False, 'error': 'Booking not found'}), 404
 
-        property_obj = Property.query.get(booking.property_id)
+        property_obj = db.session.get(Property, booking.property_id)
         if not property_obj or property_obj.owner_id != session['user_id']:
             return jsonify({'success': False, 'error': 'Unauthorized access'}), 403
 
@@ -233,7 +233,7 @@ def update_booking_status(booking_id):
 
         # ✅ FIX: Release the viewing slot back to availability when booking is cancelled
         if new_status == 'cancelled' and booking.viewing_slot_id:
-            viewing_slot = ViewingSlot.query.get(booking.viewing_slot_id)
+            viewing_slot = db.session.get(ViewingSlot, booking.viewing_slot_id)
             if viewing_slot:
                 viewing_slot.is_available = True
                 viewing_slot.booked_by_user_id = None
@@ -273,7 +273,7 @@ def get_booking(booking_id):
         if not booking:
             return jsonify({'success': False, 'error': 'Booking not found'}), 404
 
-        property_obj = Property.query.get(booking.property_id)
+        property_obj = db.session.get(Property, booking.property_id)
         if (booking.user_id != session['user_id'] and
                 (not property_obj or property_obj.owner_id != session['user_id'])):
             return jsonify({'success': False, 'error': 'Unauthorized access'}), 403
@@ -325,7 +325,7 @@ def reschedule_booking(booking_id):
         if not booking:
             return jsonify({'success': False, 'error': 'Booking not found'}), 404
 
-        property_obj = Property.query.get(booking.property_id)
+        property_obj = db.session.get(Property, booking.property_id)
         user_id = session['user_id']
 
         if booking.user_id != user_id and property_obj.owner_id != user_id:
@@ -390,7 +390,7 @@ def decline_reschedule(booking_id):
         if not booking:
             return jsonify({'success': False, 'error': 'Booking not found'}), 404
 
-        property_obj = Property.query.get(booking.property_id)
+        property_obj = db.session.get(Property, booking.property_id)
         user_id = session['user_id']
 
         if property_obj.owner_id != user_id and booking.user_id != user_id:
@@ -446,7 +446,7 @@ def approve_reschedule(booking_id):
         if not booking:
             return jsonify({'success': False, 'error': 'Booking not found'}), 404
 
-        property_obj = Property.query.get(booking.property_id)
+        property_obj = db.session.get(Property, booking.property_id)
         user_id = session['user_id']
 
         if booking.user_id != user_id and property_obj.owner_id != user_id:
@@ -488,7 +488,7 @@ def cancel_reschedule(booking_id):
         if not booking:
             return jsonify({'success': False, 'error': 'Booking not found'}), 404
 
-        property_obj = Property.query.get(booking.property_id)
+        property_obj = db.session.get(Property, booking.property_id)
         user_id = session['user_id']
 
         if booking.user_id != user_id and property_obj.owner_id != user_id:
@@ -586,7 +586,7 @@ def mark_booking_as_seen(booking_id):
     if not booking:
         return jsonify({'success': False, 'error': 'Booking not found'}), 404
 
-    prop = Property.query.get(booking.property_id)
+    prop = db.session.get(Property, booking.property_id)
     if not prop or prop.owner_id != session['user_id']:
         return jsonify({'success': False, 'error': 'Unauthorized'}), 403
 
@@ -613,7 +613,7 @@ def create_booking_from_slot():
         if not slot_id or not property_id:
             return jsonify({'success': False, 'error': 'slot_id and property_id are required'}), 400
 
-        slot = ViewingSlot.query.get(slot_id)
+        slot = db.session.get(ViewingSlot, slot_id)
         if not slot or not slot.is_available:
             return jsonify({'success': False, 'error': 'Viewing slot not found or already booked'}), 404
 
@@ -681,7 +681,7 @@ def resolve_availability_conflicts():
                 booking.status = 'cancelled'
 
                 if booking.viewing_slot_id:
-                    slot_to_delete = ViewingSlot.query.get(booking.viewing_slot_id)
+                    slot_to_delete = db.session.get(ViewingSlot, booking.viewing_slot_id)
                     if slot_to_delete:
                         # Unlink the booking from the slot before deleting
                         booking.viewing_slot_id = None
@@ -701,7 +701,7 @@ def resolve_availability_conflicts():
                 
                 # ✅ CRITICAL FIX: Free up the old viewing slot when reschedule is requested
                 if booking.viewing_slot_id:
-                    viewing_slot = ViewingSlot.query.get(booking.viewing_slot_id)
+                    viewing_slot = db.session.get(ViewingSlot, booking.viewing_slot_id)
                     if viewing_slot:
                         viewing_slot.is_available = True
                         viewing_slot.booked_by_user_id = None
@@ -729,10 +729,7 @@ def resolve_availability_conflicts():
         start_date = datetime.strptime(data['start_date'], '%Y-%m-%d').date()
         end_date = datetime.strptime(data['end_date'], '%Y-%m-%d').date()
         schedule = data.get('schedule', {})
-        day_mapping = {
-            'sunday': 6, 'monday': 0, 'tuesday': 1, 'wednesday': 2,
-            'thursday': 3, 'friday': 4, 'saturday': 5
-        }
+        schedule_by_weekday = ViewingSlot.schedule_by_weekday(schedule)
 
         ViewingSlot.query.filter(
             ViewingSlot.landlord_id == landlord_id,
@@ -740,33 +737,9 @@ def resolve_availability_conflicts():
             ViewingSlot.is_available == True
         ).delete()
 
-        slots_created = 0
-        current_date = start_date
-        while current_date <= end_date:
-            weekday = current_date.weekday()
-            for day_name, day_config in schedule.items():
-                if day_mapping.get(day_name.lower()) == weekday:
-                    from_time = datetime.strptime(day_config['from'], '%H:%M').time()
-                    to_time = datetime.strptime(day_config['to'], '%H:%M').time()
-                    if to_time <= from_time: continue
-
-                    current_slot_start = datetime.combine(current_date, from_time)
-                    end_datetime = datetime.combine(current_date, to_time)
-
-                    while current_slot_start < end_datetime:
-                        current_slot_end = current_slot_start + timedelta(minutes=30)
-                        if current_slot_end > end_datetime: break
-
-                        db.session.add(ViewingSlot(
-                            landlord_id=landlord_id,
-                            date=current_slot_start.date(),
-                            start_time=current_slot_start.time(),
-                            end_time=current_slot_end.time()
-                        ))
-                        slots_created += 1
-                        current_slot_start = current_slot_end
-            current_date += timedelta(days=1)
-
+        slots_created = ViewingSlot.create_schedule_slots(
+            landlord_id, start_date, end_date, schedule_by_weekday
+        )
         db.session.commit()
 
         return jsonify({
@@ -806,7 +779,7 @@ def select_reschedule_slot(booking_id):
             return jsonify({'success': False, 'error': 'No landlord reschedule request found'}), 400
 
         # Get the selected viewing slot
-        viewing_slot = ViewingSlot.query.get(viewing_slot_id)
+        viewing_slot = db.session.get(ViewingSlot, viewing_slot_id)
         if not viewing_slot:
             return jsonify({'success': False, 'error': 'Viewing slot not found'}), 404
 
@@ -831,7 +804,7 @@ def select_reschedule_slot(booking_id):
 
         # Free up the old viewing slot if it exists and is different
         if old_viewing_slot_id and old_viewing_slot_id != viewing_slot.id:
-            old_slot = ViewingSlot.query.get(old_viewing_slot_id)
+            old_slot = db.session.get(ViewingSlot, old_viewing_slot_id)
             if old_slot:
                 old_slot.is_available = True
                 old_slot.booked_by_user_id = None
@@ -840,7 +813,7 @@ def select_reschedule_slot(booking_id):
         print(f"✅ Updated booking {booking_id} to new slot {viewing_slot.id}")
 
         # Notify the landlord
-        property_obj = Property.query.get(booking.property_id)
+        property_obj = db.session.get(Property, booking.property_id)
         tenant = User.query.get(booking.user_id)
         
         landlord_notification = Notification(
@@ -0,0 +1,19 @@
+from functools import wraps
+from flask import g, jsonify, session
+
+
+def login_required(f):
+    """
+    Reject requests without a logged-in session user with a 401.
+
+    Runs before the view touches the database, so anonymous requests never
+    check out a pooled connection. The user id is available as g.user_id.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        user_id = session.get('user_id')
+        if not user_id:
+            return jsonify({'success': False, 'error': 'Authentication required'}), 401
+        g.user_id = user_id
+        return f(*args, **kwargs)
+    return decorated_function
@@ -477,17 +477,23 @@ def landlord_respond_to_disputes(deposit_id):
             print(f"DEBUG: Claim resolution notes: {claim.resolution_notes}")
         
         # Update deposit transaction status based on claim resolutions
-        all_claims = DepositClaim.query.filter_by(deposit_transaction_id=deposit_id).all()
-        
-        resolved_count = sum(1 for claim in all_claims if claim.status in [DepositClaimStatus.RESOLVED, DepositClaimStatus.ACCEPTED])
-        mediation_count = sum(1 for claim in all_claims if claim.status == DepositClaimStatus.UNDER_REVIEW)
-        disputed_count = sum(1 for claim in all_claims if claim.status == DepositClaimStatus.DISPUTED)
+        # (tally claim statuses in SQL instead of loading every claim row)
+        status_counts = dict(db.session.execute(
+            db.select(DepositClaim.status, db.func.count())
+            .where(DepositClaim.deposit_transaction_id == deposit_id)
+            .group_by(DepositClaim.status)
+        ).all())
+        total_claims = sum(status_counts.values())
+        
+        resolved_count = status_counts.get(DepositClaimStatus.RESOLVED, 0) + status_counts.get(DepositClaimStatus.ACCEPTED, 0)
+        mediation_count = status_counts.get(DepositClaimStatus.UNDER_REVIEW, 0)
+        disputed_count = status_counts.get(DepositClaimStatus.DISPUTED, 0)
         
         if mediation_count > 0:
             deposit.status = DepositTransactionStatus.DISPUTED  # Use correct enum value
         elif disputed_count > 0:
             deposit.status = DepositTransactionStatus.DISPUTED
-        elif resolved_count == len(all_claims):
+        elif resolved_count == total_claims:
             deposit.status = DepositTransactionStatus.PARTIALLY_RELEASED  # Claims resolved, may need fund release
         
         deposit.updated_at = datetime.utcnow()
@@ -513,7 +519,7 @@ def landlord_respond_to_disputes(deposit_id):
             next_action = "awaiting_mediation"
         elif disputed_count > 0:
             next_action = "awaiting_tenant_response"
-        elif resolved_count == len(all_claims):
+        elif resolved_count == total_claims:
             next_action = "all_resolved"
         
         return jsonify({
@@ -704,6 +710,7 @@ def create_deposit():
             },
             status=DepositTransactionStatus.PENDING
         )
+        deposit.snapshot_agreement_details(agreement)
         
         db.session.add(deposit)
         db.session.commit()
@@ -953,18 +960,23 @@ def get_deposit_by_agreement(agreement_id):
         if deposit.tenant_id != user_id and deposit.landlord_id != user_id:
             return jsonify({'success': False, 'error': 'Access denied'}), 403
         
-        # Get tenancy agreement details
-        agreement = TenancyAgreement.query.get(agreement_id)
-        if not agreement:
+        # Display details are snapshotted on the deposit; only the lease end
+        # date (which can change after creation) is read from the agreement
+        agreement_details = deposit.get_agreement_details()
+        if not agreement_details:
             return jsonify({'success': False, 'error': 'Agreement not found'}), 404
         
+        lease_end_date = db.session.query(TenancyAgreement.lease_end_date).filter(
+            TenancyAgreement.id == agreement_id
+        ).scalar()
+        
         # Check tenancy status
         from datetime import datetime, timedelta
         tenancy_ending_soon = False
         tenancy_has_ended = False
         
-        if agreement.lease_end_date:
-            days_until_end = (agreement.lease_end_date - datetime.now().date()).days
+        if lease_end_date:
+            days_until_end = (lease_end_date - datetime.now().date()).days
             tenancy_ending_soon = days_until_end <= 7 and days_until_end >= 0
             tenancy_has_ended = days_until_end < 0  # Tenancy has actually ended
         
@@ -981,9 +993,9 @@ def get_deposit_by_agreement(agreement_id):
 
         deposit_data = deposit.to_dict()
         deposit_data.update({
-            'property_address': agreement.property_address,
-            'tenant_name': agreement.tenant_full_name,
-            'landlord_name': agreement.landlord_full_name,
+            'property_address': agreement_details['property_address'],
+            'tenant_name': agreement_details['tenant_name'],
+            'landlord_name': agreement_details['landlord_name'],
             'tenancy_ending_soon': tenancy_ending_soon,
             'tenancy_has_ended': tenancy_has_ended,  # Add actual ended status
             'claims': [claim.to_dict() for claim in claims],
@@ -1100,9 +1112,9 @@ def get_claim_details(claim_id):
         if initial_claim.tenant_id != user_id and initial_claim.landlord_id != user_id:
             return jsonify({'success': False, 'error': 'Access denied'}), 403
 
-        # Get parent objects
+        # Get parent deposit (agreement display details are snapshotted on it)
         deposit = DepositTransaction.query.get(initial_claim.deposit_transaction_id)
-        agreement = TenancyAgreement.query.get(initial_claim.tenancy_agreement_id)
+        agreement_details = deposit.get_agreement_details() if deposit else None
 
         # Check if inspection period is still active (for tenants)
         inspection_status = deposit_deadline_service.get_inspection_period_status(deposit)
@@ -1112,9 +1124,9 @@ def get_claim_details(claim_id):
             return jsonify({
                 'success': True,
                 'claims': [],  # Empty claims during inspection period
-                'property_address': agreement.property_address if agreement else 'Unknown',
-                'tenant_name': agreement.tenant_full_name if agreement else 'Unknown',
-                'landlord_name': agreement.landlord_full_name if agreement else 'Unknown',
+                'property_address': agreement_details['property_address'] if agreement_details else 'Unknown',
+                'tenant_name': agreement_details['tenant_name'] if agreement_details else 'Unknown',
+                'landlord_name': agreement_details['landlord_name'] if agreement_details else 'Unknown',
                 'deposit_amount': float(deposit.amount) if deposit else 0,
                 'inspection_status': inspection_status,
                 'message': f'Landlord has {inspection_status["days_remaining"]} days remaining to finalize claims.'
@@ -1131,9 +1143,9 @@ def get_claim_details(claim_id):
         return jsonify({
             'success': True,
             'claims': claims_data,  # Return a list of claims
-            'property_address': agreement.property_address if agreement else 'Unknown',
-            'tenant_name': agreement.tenant_full_name if agreement else 'Unknown',
-            'landlord_name': agreement.landlord_full_name if agreement else 'Unknown',
+            'property_address': agreement_details['property_address'] if agreement_details else 'Unknown',
+            'tenant_name': agreement_details['tenant_name'] if agreement_details else 'Unknown',
+            'landlord_name': agreement_details['landlord_name'] if agreement_details else 'Unknown',
             'deposit_amount': float(deposit.amount) if deposit else 0,
             'inspection_status': inspection_status
         })
@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify, send_file, current_app, session
 from werkzeug.utils import secure_filename
 from werkzeug.exceptions import RequestEntityTooLarge
 from functools import wraps
+import mimetypes
 import os
 
 documents_bp = Blueprint('documents', __name__)
@@ -19,9 +20,16 @@ from ..models.application import Application, db
 from ..services.file_service import FileService
 
 
+# Pre-formatted error for an unknown document type
+_INVALID_DOCUMENT_TYPE_ERROR = f'Invalid document type. Allowed types: {", ".join(FileService.DOCUMENT_TYPES)}'
+
+
 def get_file_service():
-    """Get FileService instance within application context."""
-    return FileService()
+    """Get the app's FileService instance, creating it on first use."""
+    file_service = current_app.extensions.get('file_service')
+    if file_service is None:
+        file_service = current_app.extensions['file_service'] = FileService()
+    return file_service
 
 
 @documents_bp.route('/upload/documents/<int:application_id>', methods=['POST'])
@@ -38,7 +46,7 @@ def upload_document(application_id):
         file_service = get_file_service()
         
         # Get the application
-        application = Application.query.get_or_404(application_id)
+        application = db.get_or_404(Application, application_id)
         
         # Check if user has permission to upload documents for this application
         if session['user_id'] != application.tenant_id:
@@ -55,8 +63,8 @@ def upload_document(application_id):
             return jsonify({'error': 'Document type is required'}), 400
         
         # Validate document type
-        if document_type not in file_service.DOCUMENT_TYPES:
-            return jsonify({'error': f'Invalid document type. Allowed types: {", ".join(file_service.DOCUMENT_TYPES)}'}), 400
+        if document_type not in file_service.DOCUMENT_TYPE_SET:
+            return jsonify({'error': _INVALID_DOCUMENT_TYPE_ERROR}), 400
         
         # Delete existing file if it exists
         existing_path = getattr(application, f'{document_type}_path')
@@ -111,7 +119,7 @@ def get_document(application_id, document_type):
         file_service = get_file_service()
         
         # Get the application
-        application = Application.query.get_or_404(application_id)
+        application = db.get_or_404(Application, application_id)
         
         # Check if user has permission to view documents for this application
         # Tenant can view their own documents, landlord can view tenant documents for their properties
@@ -119,8 +127,8 @@ def get_document(application_id, document_type):
             return jsonify({'error': 'Unauthorized to view documents for this application'}), 403
         
         # Validate document type
-        if document_type not in file_service.DOCUMENT_TYPES:
-            return jsonify({'error': f'Invalid document type. Allowed types: {", ".join(file_service.DOCUMENT_TYPES)}'}), 400
+        if document_type not in file_service.DOCUMENT_TYPE_SET:
+            return jsonify({'error': _INVALID_DOCUMENT_TYPE_ERROR}), 400
         
         # Get the file path from the application
         file_path = getattr(application, f'{document_type}_path')
@@ -141,12 +149,29 @@ def get_document(application_id, document_type):
         # Get original filename for download
         original_filename = os.path.basename(file_path)
         
-        return send_file(
-            abs_path,
-            as_attachment=download,
-            download_name=original_filename if download else None,
-            mimetype=None  # Let Flask auto-detect
-        )
+        accel_prefix = current_app.config.get('X_ACCEL_REDIRECT_PREFIX')
+        if accel_prefix:
+            # Behind nginx: send only headers and let nginx stream the file from
+            # its internal location (it also handles ranges and conditional requests)
+            response = current_app.response_class(
+                mimetype=mimetypes.guess_type(original_filename)[0] or 'application/octet-stream'
+            )
+            response.headers['X-Accel-Redirect'] = f"{accel_prefix.rstrip('/')}/{file_path}"
+            if download:
+                response.headers.set('Content-Disposition', 'attachment', filename=original_filename)
+        else:
+            # send_file sets ETag/Last-Modified and answers conditional requests with 304
+            response = send_file(
+                abs_path,
+                as_attachment=download,
+                download_name=original_filename if download else None,
+                mimetype=None  # Let Flask auto-detect
+            )
+        
+        # Keep the revalidated copy in the browser only
+        response.cache_control.private = True
+        
+        return response
         
     except Exception as e:
         current_app.logger.error(f"Error serving document: {str(e)}")
@@ -163,15 +188,15 @@ def delete_document(application_id, document_type):
         file_service = get_file_service()
         
         # Get the application
-        application = Application.query.get_or_404(application_id)
+        application = db.get_or_404(Application, application_id)
         
         # Check if user has permission to delete documents for this application
         if session['user_id'] != application.tenant_id:
             return jsonify({'error': 'Unauthorized to delete documents for this application'}), 403
         
         # Validate document type
-        if document_type not in file_service.DOCUMENT_TYPES:
-            return jsonify({'error': f'Invalid document type. Allowed types: {", ".join(file_service.DOCUMENT_TYPES)}'}), 400
+        if document_type not in file_service.DOCUMENT_TYPE_SET:
+            return jsonify({'error': _INVALID_DOCUMENT_TYPE_ERROR}), 400
         
         # Get the file path from the application
         file_path = getattr(application, f'{document_type}_path')
@@ -216,19 +241,21 @@ def list_documents(application_id):
         file_service = get_file_service()
         
         # Get the application
-        application = Application.query.get_or_404(application_id)
+        application = db.get_or_404(Application, application_id)
         
         # Check if user has permission to view documents for this application
         if session['user_id'] != application.tenant_id and session['user_id'] != application.landlord_id:
             return jsonify({'error': 'Unauthorized to view documents for this application'}), 403
         
         documents = {}
+        file_paths = {doc_type: getattr(application, f'{doc_type}_path') for doc_type in file_service.DOCUMENT_TYPES}
+        
+        # An application's documents share one folder; read it once for all of them
+        files_info = file_service.get_files_info(file_paths.values())
         
-        for doc_type in file_service.DOCUMENT_TYPES:
-            file_path = getattr(application, f'{doc_type}_path')
-            
+        for doc_type, file_path in file_paths.items():
             if file_path:
-                file_info = file_service.get_file_info(file_path)
+                file_info = files_info.get(file_path)
                 documents[doc_type] = {
                     'uploaded': True,
                     'file_path': file_path,
@@ -2,14 +2,21 @@ from flask import Blueprint, request, jsonify
 from werkzeug.utils import secure_filename
 import os
 
+from ..services.file_service import UPLOAD_BUFFER_SIZE
+
 file_bp = Blueprint("file_bp", __name__)
 
 UPLOAD_FOLDER = "/uploads"
-ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "gif", "pdf", "doc", "docx"}
+ALLOWED_EXTENSIONS = frozenset({"png", "jpg", "jpeg", "gif", "pdf", "doc", "docx"})
+
+@file_bp.record_once
+def _create_upload_folder(state):
+    """Create the upload folder once when the blueprint is registered"""
+    os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 def allowed_file(filename):
-    return "." in filename and \
-           filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
+    _, dot, extension = filename.rpartition(".")
+    return bool(dot) and extension.lower() in ALLOWED_EXTENSIONS
 
 @file_bp.route("/upload", methods=["POST"])
 def upload_file():
@@ -20,11 +27,9 @@ def upload_file():
         return jsonify({"error": "No selected file"}), 400
     if file and allowed_file(file.filename):
         filename = secure_filename(file.filename)
-        # Ensure the upload folder exists
-        if not os.path.exists(UPLOAD_FOLDER):
-            os.makedirs(UPLOAD_FOLDER)
-        file.save(os.path.join(UPLOAD_FOLDER, filename))
-        return jsonify({"message": "File uploaded successfully", "file_path": os.path.join(UPLOAD_FOLDER, filename)}), 200
+        file_path = os.path.join(UPLOAD_FOLDER, filename)
+        file.save(file_path, buffer_size=UPLOAD_BUFFER_SIZE)
+        return jsonify({"message": "File uploaded successfully", "file_path": file_path}), 200
     return jsonify({"error": "File type not allowed"}), 400
 
 
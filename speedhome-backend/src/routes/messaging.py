@@ -1,41 +1,88 @@
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify, g
 from datetime import datetime
 from ..models.user import db, User
 from ..models.conversation import Conversation
 from ..models.message import Message
 from ..models.booking import Booking
 from ..models.property import Property
+from sqlalchemy import func, insert, lambda_stmt, select, tuple_, update
+from sqlalchemy.orm import joinedload
+from ..query_counter import strict_loading
+from .decorators import login_required
+from ..services.ttl_cache import TTLCache, MISSING
 
 messaging_bp = Blueprint('messaging', __name__)
 
+MAX_MESSAGES_PER_PAGE = 100
+
+# (tenant_id, landlord_id) per conversation id. Participants never change once a
+# conversation exists, so a chat session authorizes against this instead of
+# re-reading the conversation row on every call. Unknown ids are not cached.
+_participants_cache = TTLCache(ttl=600, maxsize=4096)
+
+def _remember_participants(conversation):
+    _participants_cache.set(conversation.id, (conversation.tenant_id, conversation.landlord_id))
+
+def _is_participant(conversation_id, user_id):
+    """True if user_id is the tenant or landlord of the conversation"""
+    participants = _participants_cache.get(conversation_id)
+    if participants is MISSING:
+        participants = db.session.execute(lambda_stmt(
+            lambda: select(Conversation.tenant_id, Conversation.landlord_id).where(Conversation.id == conversation_id)
+        )).first()
+        if participants is None:
+            return False
+        participants = tuple(participants)
+        _participants_cache.set(conversation_id, participants)
+    return user_id in participants
+
 @messaging_bp.route('/conversations', methods=['GET'])
+@login_required
 def get_user_conversations():
     """Get all conversations for the current user"""
     try:
-        if 'user_id' not in session:
-            return jsonify({'success': False, 'error': 'Authentication required'}), 401
-        
-        user_id = session['user_id']
+        user_id = g.user_id
         user = User.query.get(user_id)
         
         if not user:
             return jsonify({'success': False, 'error': 'User not found'}), 404
         
-        # Get conversations where user is either tenant or landlord
-        conversations = Conversation.query.filter(
+        # Get conversations where user is either tenant or landlord, with the
+        # participants, booking and property loaded in the same query (only the
+        # columns the response uses)
+        participant_columns = (User.id, User.first_name, User.last_name, User.role, User.profile_picture)
+        conversations = Conversation.query.options(
+            joinedload(Conversation.tenant).load_only(*participant_columns),
+            joinedload(Conversation.landlord).load_only(*participant_columns),
+            joinedload(Conversation.booking).load_only(Booking.status),
+            joinedload(Conversation.property).load_only(Property.title),
+            *strict_loading()
+        ).filter(
             (Conversation.tenant_id == user_id) | (Conversation.landlord_id == user_id)
         ).order_by(Conversation.last_message_at.desc().nullslast(), Conversation.updated_at.desc()).all()
         
+        # Message and unread counts for all conversations in one grouped query
+        counts = {}
+        if conversations:
+            counts = {
+                conversation_id: (message_count, unread_count)
+                for conversation_id, message_count, unread_count in db.session.execute(
+                    select(
+                        Message.conversation_id,
+                        func.count(),
+                        func.count().filter(Message.sender_id != user_id, Message.is_read == False)
+                    ).where(
+                        Message.conversation_id.in_([conv.id for conv in conversations])
+                    ).group_by(Message.conversation_id)
+                )
+            }
+        
         conversations_data = []
         for conv in conversations:
-            conv_dict = conv.to_dict()
+            message_count, unread_count = counts.get(conv.id, (0, 0))
+            conv_dict = conv.to_dict(message_count=message_count)
             
             # Add unread message count for this user
-            unread_count = Message.query.filter(
-                Message.conversation_id == conv.id,
-                Message.sender_id != user_id,
-                Message.is_read == False
-            ).count()
             conv_dict['unread_count'] = unread_count
             
             # Add the other participant's info
@@ -62,72 +109,88 @@ def get_user_conversations():
         return jsonify({'success': False, 'error': f'An error occurred: {str(e)}'}), 500
 
 @messaging_bp.route('/conversations/<int:conversation_id>/messages', methods=['GET'])
+@login_required
 def get_conversation_messages(conversation_id):
     """Get all messages for a specific conversation"""
     try:
-        if 'user_id' not in session:
-            return jsonify({'success': False, 'error': 'Authentication required'}), 401
-        
-        user_id = session['user_id']
-        
-        # Verify user has access to this conversation
-        conversation = Conversation.query.filter(
+        user_id = g.user_id
+        
+        # Verify user has access to this conversation; the participants and
+        # property are loaded for to_dict() and double as the message senders
+        conversation = Conversation.query.options(
+            joinedload(Conversation.tenant),
+            joinedload(Conversation.landlord),
+            joinedload(Conversation.property)
+        ).filter(
             Conversation.id == conversation_id,
             (Conversation.tenant_id == user_id) | (Conversation.landlord_id == user_id)
         ).first()
         
         if not conversation:
             return jsonify({'success': False, 'error': 'Conversation not found or access denied'}), 404
+        _remember_participants(conversation)
         
-        # Get messages with pagination support
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 50, type=int)
+        # Keyset pagination: ?before=<created_at>,<id> of the oldest message
+        # already shown&limit=N. The id breaks ties between messages sent in the
+        # same instant. Walks the (conversation_id, created_at) index backwards
+        # with no COUNT(*); per_page is still accepted as the limit
+        limit = request.args.get('limit', request.args.get('per_page', 50, type=int), type=int)
+        limit = max(1, min(limit, MAX_MESSAGES_PER_PAGE))
+        before = request.args.get('before')
         
         messages_query = Message.query.filter(
             Message.conversation_id == conversation_id
-        ).order_by(Message.created_at.asc())
-        
-        messages = messages_query.paginate(
-            page=page, per_page=per_page, error_out=False
         )
-        
-        messages_data = [message.to_dict() for message in messages.items]
-        
-        # Mark unread messages as read
-        unread_messages = Message.query.filter(
+        if before:
+            before_created, _, before_id = before.rpartition(',')
+            try:
+                cursor = (datetime.fromisoformat(before_created), int(before_id))
+            except ValueError:
+                return jsonify({'success': False, 'error': 'Invalid before cursor'}), 400
+            messages_query = messages_query.filter(tuple_(Message.created_at, Message.id) < cursor)
+        
+        # One extra row tells us whether an older page exists
+        messages = messages_query.order_by(
+            Message.created_at.desc(), Message.id.desc()
+        ).limit(limit + 1).all()
+        has_next = len(messages) > limit
+        messages = messages[:limit]
+        next_cursor = f'{messages[-1].created_at.isoformat()},{messages[-1].id}' if has_next else None
+        
+        # Returned oldest-first for display
+        messages_data = [message.to_dict() for message in reversed(messages)]
+        
+        # Serialize before the commit below expires the loaded conversation
+        conversation_data = conversation.to_dict()
+        
+        # Mark unread messages as read in a single UPDATE (same columns as Message.mark_as_read)
+        Message.query.filter(
             Message.conversation_id == conversation_id,
             Message.sender_id != user_id,
             Message.is_read == False
-        ).all()
-        
-        for message in unread_messages:
-            message.mark_as_read(user_id)
+        ).update({'is_read': True, 'read_at': datetime.utcnow()}, synchronize_session=False)
+        db.session.commit()
         
         return jsonify({
             'success': True,
             'messages': messages_data,
             'pagination': {
-                'page': messages.page,
-                'pages': messages.pages,
-                'per_page': messages.per_page,
-                'total': messages.total,
-                'has_next': messages.has_next,
-                'has_prev': messages.has_prev
+                'limit': limit,
+                'has_next': has_next,
+                'next_cursor': next_cursor
             },
-            'conversation': conversation.to_dict()
+            'conversation': conversation_data
         }), 200
         
     except Exception as e:
         return jsonify({'success': False, 'error': f'An error occurred: {str(e)}'}), 500
 
 @messaging_bp.route('/conversations/<int:conversation_id>/messages', methods=['POST'])
+@login_required
 def send_message(conversation_id):
     """Send a new message in a conversation"""
     try:
-        if 'user_id' not in session:
-            return jsonify({'success': False, 'error': 'Authentication required'}), 401
-        
-        user_id = session['user_id']
+        user_id = g.user_id
         data = request.get_json()
         
         if not data or 'message_body' not in data:
@@ -137,14 +200,21 @@ def send_message(conversation_id):
         if not message_body:
             return jsonify({'success': False, 'error': 'Message cannot be empty'}), 400
         
-        # Verify user has access to this conversation
-        conversation = Conversation.query.filter(
+        # Verify user has access to this conversation, loading the booking for
+        # the send check and the participants' names for the sender fields
+        participant_columns = (User.id, User.first_name, User.last_name, User.role)
+        conversation = Conversation.query.options(
+            joinedload(Conversation.booking),
+            joinedload(Conversation.tenant).load_only(*participant_columns),
+            joinedload(Conversation.landlord).load_only(*participant_columns)
+        ).filter(
             Conversation.id == conversation_id,
             (Conversation.tenant_id == user_id) | (Conversation.landlord_id == user_id)
         ).first()
         
         if not conversation:
             return jsonify({'success': False, 'error': 'Conversation not found or access denied'}), 404
+        _remember_participants(conversation)
         
         # Check if user can send messages (Rules of Engagement)
         booking = conversation.booking
@@ -154,29 +224,40 @@ def send_message(conversation_id):
                 'error': 'Cannot send messages for this booking. The viewing may be completed, cancelled, or declined.'
             }), 403
         
-        # Create the message
-        message = Message(
+        # Insert the message and update the conversation's last message info
+        # in one statement, so both always describe the same message
+        now = datetime.utcnow()
+        new_message = insert(Message).values(
             conversation_id=conversation_id,
             sender_id=user_id,
             message_body=message_body,
-            message_type=data.get('message_type', 'text')
-        )
-        
-        db.session.add(message)
-        
-        # Update conversation metadata
-        conversation.last_message_at = datetime.utcnow()
-        conversation.last_message_by = user_id
-
-        conversation.last_message_body = message_body
-
-        conversation.updated_at = datetime.utcnow()
-        
+            message_type=data.get('message_type', 'text'),
+            is_read=False,
+            is_edited=False,
+            created_at=now,
+            updated_at=now
+        ).returning(*Message.__table__.c).cte('new_message')
+        
+        message = db.session.execute(
+            select(Message).from_statement(
+                update(Conversation).where(
+                    Conversation.id == new_message.c.conversation_id
+                ).values(
+                    last_message_at=new_message.c.created_at,
+                    last_message_by=new_message.c.sender_id,
+                    last_message_body=func.left(new_message.c.message_body, 255),
+                    updated_at=now
+                ).returning(*new_message.c)
+            )
+        ).scalar_one()
+        
+        # Serialize before the commit expires the loaded sender
+        message_data = message.to_dict()
         db.session.commit()
         
         return jsonify({
             'success': True,
-            'message': message.to_dict()
+            'message': message_data
         }), 201
         
     except Exception as e:
@@ -184,13 +265,11 @@ def send_message(conversation_id):
         return jsonify({'success': False, 'error': f'An error occurred: {str(e)}'}), 500
 
 @messaging_bp.route('/conversations/create', methods=['POST'])
+@login_required
 def create_conversation():
     """Create a new conversation (usually triggered when a booking is created)"""
     try:
-        if 'user_id' not in session:
-            return jsonify({'success': False, 'error': 'Authentication required'}), 401
-        
-        user_id = session['user_id']
+        user_id = g.user_id
         data = request.get_json()
         
         if not data or 'booking_id' not in data:
@@ -204,7 +283,7 @@ def create_conversation():
             return jsonify({'success': False, 'error': 'Booking not found'}), 404
         
         # Verify user is either the tenant who made the booking or the landlord who owns the property
-        property_obj = Property.query.get(booking.property_id)
+        property_obj = db.session.get(Property, booking.property_id)
         if not property_obj:
             return jsonify({'success': False, 'error': 'Property not found'}), 404
         
@@ -247,13 +326,11 @@ def create_conversation():
         return jsonify({'success': False, 'error': f'An error occurred: {str(e)}'}), 500
 
 @messaging_bp.route('/messages/<int:message_id>', methods=['PUT'])
+@login_required
 def edit_message(message_id):
     """Edit an existing message"""
     try:
-        if 'user_id' not in session:
-            return jsonify({'success': False, 'error': 'Authentication required'}), 401
-        
-        user_id = session['user_id']
+        user_id = g.user_id
         data = request.get_json()
         
         if not data or 'message_body' not in data:
@@ -282,13 +359,11 @@ def edit_message(message_id):
         return jsonify({'success': False, 'error': f'An error occurred: {str(e)}'}), 500
 
 @messaging_bp.route('/messages/<int:message_id>', methods=['DELETE'])
+@login_required
 def delete_message(message_id):
     """Delete a message"""
     try:
-        if 'user_id' not in session:
-            return jsonify({'success': False, 'error': 'Authentication required'}), 401
-        
-        user_id = session['user_id']
+        user_id = g.user_id
         
         message = Message.query.get(message_id)
         if not message:
@@ -297,22 +372,27 @@ def delete_message(message_id):
         if not message.can_delete(user_id):
             return jsonify({'success': False, 'error': 'Cannot delete this message'}), 403
         
-        conversation_id = message.conversation_id
+        conversation = message.conversation
+        deleted_at = message.created_at
         db.session.delete(message)
         
-        # Update conversation's last message info if this was the last message
-        conversation = Conversation.query.get(conversation_id)
-        if conversation:
-            last_message = Message.query.filter(
-                Message.conversation_id == conversation_id
-            ).order_by(Message.created_at.desc()).first()
+        # Recompute the conversation's last message info only if this was the
+        # last message; older messages can't change it
+        if conversation.last_message_at is None or deleted_at >= conversation.last_message_at:
+            last_message = db.session.query(
+                Message.created_at, Message.sender_id, Message.message_body
+            ).filter(
+                Message.conversation_id == conversation.id
+            ).order_by(Message.created_at.desc()).limit(1).first()
             
             if last_message:
                 conversation.last_message_at = last_message.created_at
                 conversation.last_message_by = last_message.sender_id
+                conversation.last_message_body = last_message.message_body[:255]
             else:
                 conversation.last_message_at = None
                 conversation.last_message_by = None
+                conversation.last_message_body = None
         
         db.session.commit()
         
@@ -324,24 +404,21 @@ def delete_message(message_id):
 
 
 @messaging_bp.route('/conversations/<int:conversation_id>/mark-read', methods=['POST'])
+@login_required
 def mark_conversation_as_read(conversation_id):
     """Mark all unread messages in a conversation as read for the current user."""
-    user_id = session.get('user_id')
-    if not user_id:
-        return jsonify({'success': False, 'error': 'Authentication required'}), 401
+    user_id = g.user_id
 
     # Security check: Ensure the user is a participant in the conversation
-    conversation = Conversation.query.get(conversation_id)
-    if not conversation or (user_id != conversation.tenant_id and user_id != conversation.landlord_id):
+    if not _is_participant(conversation_id, user_id):
         return jsonify({'success': False, 'error': 'Conversation not found or unauthorized'}), 404
 
-    # --- THIS IS THE FIX ---
-    # Find all unread messages sent TO the current user (i.e., where the sender is NOT the current user)
+    # Mark unread messages sent TO the current user (i.e., where the sender is NOT the current user)
     Message.query.filter(
         Message.conversation_id == conversation_id,
-        Message.sender_id != user_id,  # Changed from recipient_id to sender_id
+        Message.sender_id != user_id,
         Message.is_read == False
-    ).update({'is_read': True})
+    ).update({'is_read': True, 'read_at': datetime.utcnow()}, synchronize_session=False)
 
     db.session.commit()
 
@@ -1,30 +1,91 @@
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, g, request, jsonify
+from sqlalchemy import event, func, lambda_stmt, select
+from sqlalchemy.orm import Session, object_session
 from ..models.notification import Notification, db
 from ..models.user import User
+from ..services.ttl_cache import TTLCache
+from .decorators import login_required
+from .streaming import peek, stream_json_list
 
 notification_bp = Blueprint('notification', __name__)
 
+NOTIFICATION_STREAM_BATCH_SIZE = 200
+
+# Unread notification count per recipient, for the header badge poll
+UNREAD_COUNT_CACHE_TTL = 30
+_unread_count_cache = TTLCache(ttl=UNREAD_COUNT_CACHE_TTL)
+
+# The badge poll and list run on every page for every signed-in user; lambda
+# statements are built and cache-keyed once, later calls only bind user_id
+def _unread_count_stmt(user_id):
+    return lambda_stmt(lambda: select(func.count()).select_from(Notification).where(
+        Notification.recipient_id == user_id, Notification.is_read == False
+    ))
+
+def _unread_notifications_stmt(user_id):
+    return lambda_stmt(lambda: select(Notification).where(
+        Notification.recipient_id == user_id, Notification.is_read == False
+    ).order_by(Notification.created_at.desc()))
+
+# Session.info key collecting recipients whose notifications a flush changed
+_STALE_UNREAD_COUNTS_KEY = 'stale_unread_counts'
+
+@event.listens_for(Notification, 'after_insert')
+@event.listens_for(Notification, 'after_update')
+@event.listens_for(Notification, 'after_delete')
+def _mark_unread_count_stale(mapper, connection, target):
+    # Notifications are created by services across the app. Flush runs before
+    # commit; a badge poll now would re-cache the old count, so the entry is
+    # dropped once the change commits
+    object_session(target).info.setdefault(_STALE_UNREAD_COUNTS_KEY, set()).add(target.recipient_id)
+
+@event.listens_for(Session, 'after_commit')
+def _drop_cached_unread_counts(session):
+    _unread_count_cache.delete(*session.info.pop(_STALE_UNREAD_COUNTS_KEY, ()))
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _keep_cached_unread_counts(session, previous_transaction):
+    if not previous_transaction.nested:
+        session.info.pop(_STALE_UNREAD_COUNTS_KEY, None)
+
+@notification_bp.route('/notifications/count', methods=['GET'])
+@login_required
+def get_unread_count():
+    """Get the number of unread notifications for the logged-in user."""
+    user_id = g.user_id
+
+    count = _unread_count_cache.get_or_set(
+        user_id,
+        lambda: db.session.execute(_unread_count_stmt(user_id)).scalar_one()
+    )
+
+    return jsonify({'success': True, 'count': count})
+
 @notification_bp.route('/notifications', methods=['GET'])
+@login_required
 def get_notifications():
     """Get all unread notifications for the logged-in user."""
-    if 'user_id' not in session:
-        return jsonify({'success': False, 'error': 'Authentication required'}), 401
-
-    user_id = session['user_id']
+    user_id = g.user_id
     
-    notifications = Notification.query.filter_by(recipient_id=user_id, is_read=False).order_by(Notification.created_at.desc()).all()
+    # Stream the list so users with many unread notifications don't hold every
+    # row and its serialized form in memory at once; rows are fetched in
+    # batches from a server-side cursor. The first row is read before the
+    # response starts, so a failing query still gets a JSON 500
+    try:
+        _, notifications = peek(db.session.scalars(
+            _unread_notifications_stmt(user_id),
+            execution_options={'yield_per': NOTIFICATION_STREAM_BATCH_SIZE}
+        ))
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': f'An error occurred: {str(e)}'}), 500
     
-    return jsonify({
-        'success': True,
-        'notifications': [n.to_dict() for n in notifications]
-    })
+    return stream_json_list('notifications', notifications)
 
 @notification_bp.route('/notifications/mark-as-read', methods=['POST'])
+@login_required
 def mark_as_read():
     """Mark specific notifications as read."""
-    if 'user_id' not in session:
-        return jsonify({'success': False, 'error': 'Authentication required'}), 401
-
     data = request.get_json()
     notification_ids = data.get('ids', [])
 
@@ -34,9 +95,10 @@ def mark_as_read():
     # Ensure the user can only mark their own notifications as read
     Notification.query.filter(
         Notification.id.in_(notification_ids),
-        Notification.recipient_id == session['user_id']
+        Notification.recipient_id == g.user_id
     ).update({'is_read': True}, synchronize_session=False)
 
     db.session.commit()
+    _unread_count_cache.delete(g.user_id)
 
     return jsonify({'success': True, 'message': 'Notifications marked as read.'})
@@ -1,20 +1,62 @@
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify, session, g
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, object_session
 from ..models.user import db, User
+from ..services.ttl_cache import TTLCache, MISSING
+from ..services.profile_picture_service import MAX_PROFILE_PICTURE_URL_LENGTH, is_data_uri, save_profile_picture
+from .decorators import login_required
 
 profile_bp = Blueprint('profile', __name__)
 
+# Serialized profiles and preferences per user, keyed by (kind, user_id).
+# Preferences are cached on their own so reading them skips the full profile.
+PROFILE_CACHE_TTL = 300
+_profile_cache = TTLCache(ttl=PROFILE_CACHE_TTL)
+
+def _invalidate_profile(user_id):
+    """Drop every cached view of a user's profile"""
+    _profile_cache.delete(('profile', user_id), ('public', user_id), ('preferences', user_id))
+
+# Session.info key collecting users whose row a flush changed
+_STALE_PROFILES_KEY = 'stale_profiles'
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _mark_profile_stale(mapper, connection, target):
+    # Covers writes from other routes too (login, verification, admin). Flush
+    # runs before commit; a read now would re-cache the old row, so the
+    # entries are dropped once the change commits
+    object_session(target).info.setdefault(_STALE_PROFILES_KEY, set()).add(target.id)
+
+@event.listens_for(Session, 'after_commit')
+def _drop_cached_profiles(session):
+    for user_id in session.info.pop(_STALE_PROFILES_KEY, ()):
+        _invalidate_profile(user_id)
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _keep_cached_profiles(session, previous_transaction):
+    if not previous_transaction.nested:
+        session.info.pop(_STALE_PROFILES_KEY, None)
+
+def _cached_user_view(kind, user_id, serialize):
+    """Return serialize(user) from the cache, loading the user on a miss (None if not found)"""
+    data = _profile_cache.get((kind, user_id))
+    if data is MISSING:
+        user = db.session.get(User, user_id)
+        if not user:
+            return None
+        data = serialize(user)
+        _profile_cache.set((kind, user_id), data)
+    return data
+
 @profile_bp.route('/profile', methods=['GET'])
+@login_required
 def get_profile():
     """Get user profile"""
     try:
-        if 'user_id' not in session:
-            return jsonify({
-                'success': False,
-                'error': 'Not authenticated'
-            }), 401
-        
-        user = User.query.get(session['user_id'])
-        if not user:
+        profile = _cached_user_view('profile', g.user_id, User.to_dict)
+        if profile is None:
             return jsonify({
                 'success': False,
                 'error': 'User not found'
@@ -22,7 +64,7 @@ def get_profile():
         
         return jsonify({
             'success': True,
-            'profile': user.to_dict()
+            'profile': profile
         }), 200
         
     except Exception as e:
@@ -32,16 +74,11 @@ def get_profile():
         }), 500
 
 @profile_bp.route('/profile', methods=['PUT'])
+@login_required
 def update_profile():
     """Update user profile"""
     try:
-        if 'user_id' not in session:
-            return jsonify({
-                'success': False,
-                'error': 'Not authenticated'
-            }), 401
-        
-        user = User.query.get(session['user_id'])
+        user = User.query.get(g.user_id)
         if not user:
             return jsonify({
                 'success': False,
@@ -64,24 +101,49 @@ def update_profile():
         if 'company_name' in data:
             user.company_name = data['company_name']
         if 'profile_picture' in data:
-            user.profile_picture = data['profile_picture']
+            profile_picture = data['profile_picture']
+            if is_data_uri(profile_picture):
+                try:
+                    profile_picture = save_profile_picture(user.id, profile_picture)
+                except ValueError as e:
+                    return jsonify({
+                        'success': False,
+                        'error': str(e)
+                    }), 400
+            elif profile_picture is not None and (
+                not isinstance(profile_picture, str)
+                or len(profile_picture) > MAX_PROFILE_PICTURE_URL_LENGTH
+            ):
+                return jsonify({
+                    'success': False,
+                    'error': f'Profile picture must be an image upload or a URL of at most {MAX_PROFILE_PICTURE_URL_LENGTH} characters'
+                }), 400
+            user.profile_picture = profile_picture
         if 'preferences' in data:
             user.set_preferences(data['preferences'])
         
-        # Update username if provided and not taken
+        # Update username if provided; the unique index on users.username
+        # rejects a taken name, including one claimed by a concurrent request
+        username_changed = False
         if 'username' in data:
             new_username = data['username'].strip()
             if new_username != user.username:
-                existing_user = User.query.filter_by(username=new_username).first()
-                if existing_user:
-                    return jsonify({
-                        'success': False,
-                        'error': 'Username already taken'
-                    }), 400
                 user.username = new_username
-                session['username'] = new_username
+                username_changed = True
         
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            if not username_changed:
+                raise
+            return jsonify({
+                'success': False,
+                'error': 'Username already taken'
+            }), 400
+        if username_changed:
+            session['username'] = new_username
+        _invalidate_profile(user.id)
         
         return jsonify({
             'success': True,
@@ -97,16 +159,11 @@ def update_profile():
         }), 500
 
 @profile_bp.route('/profile/picture', methods=['POST'])
+@login_required
 def upload_profile_picture():
     """Upload profile picture"""
     try:
-        if 'user_id' not in session:
-            return jsonify({
-                'success': False,
-                'error': 'Not authenticated'
-            }), 401
-        
-        user = User.query.get(session['user_id'])
+        user = User.query.get(g.user_id)
         if not user:
             return jsonify({
                 'success': False,
@@ -120,9 +177,16 @@ def upload_profile_picture():
                 'error': 'Image data is required'
             }), 400
         
-        # Store base64 image data
-        user.profile_picture = data['image_data']
+        # Write the image to storage and keep only its URL on the user
+        try:
+            user.profile_picture = save_profile_picture(user.id, data['image_data'])
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         db.session.commit()
+        _invalidate_profile(user.id)
         
         return jsonify({
             'success': True,
@@ -141,8 +205,8 @@ def upload_profile_picture():
 def get_public_profile(user_id):
     """Get public profile of a user"""
     try:
-        user = User.query.get(user_id)
-        if not user:
+        profile = _cached_user_view('public', user_id, User.to_public_dict)
+        if profile is None:
             return jsonify({
                 'success': False,
                 'error': 'User not found'
@@ -150,7 +214,7 @@ def get_public_profile(user_id):
         
         return jsonify({
             'success': True,
-            'profile': user.to_public_dict()
+            'profile': profile
         }), 200
         
     except Exception as e:
@@ -160,17 +224,12 @@ def get_public_profile(user_id):
         }), 500
 
 @profile_bp.route('/preferences', methods=['GET'])
+@login_required
 def get_preferences():
     """Get user preferences"""
     try:
-        if 'user_id' not in session:
-            return jsonify({
-                'success': False,
-                'error': 'Not authenticated'
-            }), 401
-        
-        user = User.query.get(session['user_id'])
-        if not user:
+        preferences = _cached_user_view('preferences', g.user_id, User.get_preferences)
+        if preferences is None:
             return jsonify({
                 'success': False,
                 'error': 'User not found'
@@ -178,7 +237,7 @@ def get_preferences():
         
         return jsonify({
             'success': True,
-            'preferences': user.get_preferences()
+            'preferences': preferences
         }), 200
         
     except Exception as e:
@@ -188,16 +247,11 @@ def get_preferences():
         }), 500
 
 @profile_bp.route('/preferences', methods=['PUT'])
+@login_required
 def update_preferences():
     """Update user preferences"""
     try:
-        if 'user_id' not in session:
-            return jsonify({
-                'success': False,
-                'error': 'Not authenticated'
-            }), 401
-        
-        user = User.query.get(session['user_id'])
+        user = User.query.get(g.user_id)
         if not user:
             return jsonify({
                 'success': False,
@@ -207,6 +261,7 @@ def update_preferences():
         data = request.get_json()
         user.set_preferences(data)
         db.session.commit()
+        _invalidate_profile(user.id)
         
         return jsonify({
             'success': True,
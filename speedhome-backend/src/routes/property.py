@@ -1,12 +1,182 @@
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, Response, current_app, request, jsonify, session
 from src.models.property import db, Property, PropertyStatus
-from src.models.viewing_slot import ViewingSlot
-from datetime import datetime, date, time, timedelta
-import json
+from src.models.viewing_slot import ViewingSlot, MAX_AVAILABILITY_DAYS
+from src.models.amenity import Amenity, PropertyAmenity
+from src.query_counter import strict_loading
+from src.routes.streaming import peek, stream_json_list
+from src.services.ttl_cache import TTLCache, MISSING
+from src.services import property_counter_service, property_stats_service
+from sqlalchemy import event, func, lambda_stmt, select, tuple_
+from sqlalchemy.orm import Session, load_only, object_session
+from datetime import datetime, date, timedelta
+from functools import wraps
+import hashlib
+import logging
 
 property_bp = Blueprint('property', __name__)
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROPERTIES_PER_PAGE = 20
+MAX_PROPERTIES_PER_PAGE = 100
+
+# Bedroom/bathroom filters beyond this can't match a real listing
+MAX_ROOMS_FILTER = 50
+
+SLOT_STREAM_BATCH_SIZE = 500
+
+# Serialized public listing pages, keyed by endpoint and query string
+PROPERTY_LIST_CACHE_TTL = 60
+_property_list_cache = TTLCache(ttl=PROPERTY_LIST_CACHE_TTL, maxsize=512)
+
+# Session.info key set when a flush changed a listing
+_PROPERTY_LISTS_STALE_KEY = 'property_lists_stale'
+
+@event.listens_for(Property, 'after_insert')
+@event.listens_for(Property, 'after_update')
+@event.listens_for(Property, 'after_delete')
+def _mark_property_lists_stale(mapper, connection, target):
+    # Flush runs before commit; a request filling the cache now would still
+    # read the old rows, so the cache is dropped once the change commits
+    object_session(target).info[_PROPERTY_LISTS_STALE_KEY] = True
+
+@event.listens_for(Session, 'after_commit')
+def _drop_cached_property_lists(session):
+    # Any listing change can move it in or out of any filtered page
+    if session.info.pop(_PROPERTY_LISTS_STALE_KEY, False):
+        _property_list_cache.clear()
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _keep_cached_property_lists(session, previous_transaction):
+    if not previous_transaction.nested:
+        session.info.pop(_PROPERTY_LISTS_STALE_KEY, None)
+
+def cached_property_list(f):
+    """
+    Serve a public listing endpoint from the in-process cache, with an ETag.
+
+    Successful responses are cached as JSON bytes per query string, so repeat
+    requests skip the database and serialization; clients sending a matching
+    If-None-Match get a 304 with no body.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        key = (request.endpoint, tuple(sorted(request.args.items(multi=True))))
+        cached = _property_list_cache.get(key)
+        if cached is MISSING:
+            response = current_app.make_response(f(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            body = response.get_data()
+            cached = (hashlib.md5(body).hexdigest(), body)
+            _property_list_cache.set(key, cached)
+
+        etag, body = cached
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        # Let browsers keep the page but revalidate it on every use
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
+    return decorated_function
+
+def _filter_by_text(stmt, query_text):
+    """Restrict a Property lambda statement to listings whose GIN-indexed search_vector matches free text"""
+    return stmt + (lambda s: s.where(
+        Property.search_vector.op('@@')(func.plainto_tsquery('english', query_text))
+    ))
+
+def _filter_by_amenities(stmt, amenities):
+    """Restrict a Property lambda statement to listings offering every amenity in the comma-separated list"""
+    names = sorted({a.strip() for a in amenities.split(',') if a.strip()})
+    if not names:
+        return stmt
+    name_count = len(names)
+    return stmt + (lambda s: s.where(Property.id.in_(
+        select(PropertyAmenity.property_id).join(Amenity).where(
+            Amenity.name.in_(names)
+        ).group_by(PropertyAmenity.property_id).having(func.count() == name_count)
+    )))
+
+def _matches_nothing(min_price=None, max_price=None, bedrooms=None, bathrooms=None):
+    """True if the numeric filters can't match any listing, so the query can be skipped"""
+    if min_price is not None and max_price is not None and min_price > max_price:
+        return True
+    return any(rooms is not None and not 0 <= rooms <= MAX_ROOMS_FILTER for rooms in (bedrooms, bathrooms))
+
+def _page_limit():
+    """Page size from ?limit= (or page_size/per_page), clamped to 1..MAX_PROPERTIES_PER_PAGE"""
+    limit = request.args.get('limit', type=int) \
+        or request.args.get('page_size', type=int) \
+        or request.args.get('per_page', DEFAULT_PROPERTIES_PER_PAGE, type=int)
+    return max(1, min(limit, MAX_PROPERTIES_PER_PAGE))
+
+def _empty_page():
+    """Pagination block for a result that is known to be empty, shaped like _paginate's"""
+    pagination = {
+        'limit': _page_limit(),
+        'has_next': False,
+        'next_cursor': None
+    }
+    if request.args.get('with_total') and not request.args.get('before'):
+        pagination['total'] = 0
+    return pagination
+
+def _paginate(stmt):
+    """
+    Return one page of a Property lambda statement, newest first, plus its pagination info.
+
+    Keyset pagination: ?before=<date_added>,<id> of the last property already
+    shown and ?limit=N (page_size and per_page are still accepted). Walks the
+    date_added indexes with no OFFSET or COUNT(*); one extra row tells us if
+    there is a next page. The total number of matches is only counted for
+    ?with_total=1 on the first page, since it doesn't change between pages.
+
+    Raises:
+        ValueError: If the before cursor is malformed
+    """
+    limit = _page_limit()
+
+    before = request.args.get('before')
+    total = _count_matches(stmt) if request.args.get('with_total') and not before else None
+    if before:
+        before_date, _, before_id = before.rpartition(',')
+        after_cursor = tuple_(Property.date_added, Property.id) < (datetime.fromisoformat(before_date), int(before_id))
+        stmt += lambda s: s.where(after_cursor)
+
+    # to_dict() only reads columns; strict loading makes a relationship slipping
+    # into it fail in debug instead of adding a query per listing
+    loader_options = strict_loading()
+    fetch = limit + 1
+    stmt += lambda s: s.options(*loader_options).order_by(
+        Property.date_added.desc(), Property.id.desc()
+    ).limit(fetch)
+
+    properties = db.session.scalars(stmt).all()
+    has_next = len(properties) > limit
+    properties = properties[:limit]
+    next_cursor = f'{properties[-1].date_added.isoformat()},{properties[-1].id}' if has_next else None
+
+    pagination = {
+        'limit': limit,
+        'has_next': has_next,
+        'next_cursor': next_cursor
+    }
+    if total is not None:
+        pagination['total'] = total
+    return properties, pagination
+
+def _count_matches(stmt):
+    """COUNT(*) of a Property lambda statement without loading any rows"""
+    return db.session.scalar(stmt + (lambda s: s.with_only_columns(func.count(Property.id))))
+
+def _property_owner_id(property_id):
+    """Return the owner_id of a property without loading the row, or None if it doesn't exist"""
+    return db.session.execute(
+        select(Property.owner_id).where(Property.id == property_id)
+    ).scalar_one_or_none()
+
 @property_bp.route('/properties', methods=['GET'])
+@cached_property_list
 def get_properties():
     """Get all properties with optional filtering"""
     try:
@@ -18,32 +188,44 @@ def get_properties():
         property_type = request.args.get('property_type')
         amenities = request.args.get('amenities')  # Comma-separated list
         
+        # Impossible filter combinations can't match anything; skip the database
+        if _matches_nothing(min_price, max_price, bedrooms):
+            return jsonify({
+                'success': True,
+                'properties': [],
+                'count': 0,
+                'pagination': _empty_page()
+            }), 200
+        
         # Start with base query - only show publicly visible properties (Active status)
-        query = Property.query.filter(Property.status == PropertyStatus.ACTIVE)
+        stmt = lambda_stmt(lambda: select(Property).where(Property.status == PropertyStatus.ACTIVE))
         
         # Apply filters
         if location:
-            query = query.filter(Property.location.ilike(f'%{location}%'))
+            location_pattern = f'%{location}%'
+            stmt += lambda s: s.where(Property.location.ilike(location_pattern))
         
         if min_price is not None:
-            query = query.filter(Property.price >= min_price)
+            stmt += lambda s: s.where(Property.price >= min_price)
         
         if max_price is not None:
-            query = query.filter(Property.price <= max_price)
+            stmt += lambda s: s.where(Property.price <= max_price)
         
         if bedrooms is not None:
-            query = query.filter(Property.bedrooms == bedrooms)
+            stmt += lambda s: s.where(Property.bedrooms == bedrooms)
         
         if property_type:
-            query = query.filter(Property.property_type == property_type)
+            stmt += lambda s: s.where(Property.property_type == property_type)
         
         if amenities:
-            amenity_list = [a.strip() for a in amenities.split(',')]
-            for amenity in amenity_list:
-                query = query.filter(Property.amenities.like(f'%{amenity}%'))
+            stmt = _filter_by_amenities(stmt, amenities)
         
-        # Execute query and get results
-        properties = query.order_by(Property.date_added.desc()).all()
+        # ?count_only=1 returns just the number of matches, without loading any rows
+        if request.args.get('count_only'):
+            return jsonify({'success': True, 'count': _count_matches(stmt)}), 200
+        
+        # Fetch one page of results
+        properties, pagination = _paginate(stmt)
         
         # Convert to dictionary format
         properties_data = [prop.to_dict() for prop in properties]
@@ -51,9 +233,15 @@ def get_properties():
         return jsonify({
             'success': True,
             'properties': properties_data,
-            'count': len(properties_data)
+            'count': len(properties_data),
+            'pagination': pagination
         }), 200
         
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'Invalid before cursor'
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -64,7 +252,7 @@ def get_properties():
 def get_property(property_id):
     """Get a specific property by ID"""
     try:
-        property_obj = Property.query.get(property_id)
+        property_obj = db.session.get(Property, property_id)
         
         if not property_obj:
             return jsonify({
@@ -72,16 +260,18 @@ def get_property(property_id):
                 'error': 'Property not found'
             }), 404
         
-        # Increment view count
-        property_obj.views += 1
-        db.session.commit()
+        # Count the view in memory; the scheduler writes views in batches, so
+        # add the ones not yet flushed to what the database has
+        property_data = property_obj.to_dict()
+        property_data['views'] += property_counter_service.record(property_id, 'views')
         
         return jsonify({
             'success': True,
-            'property': property_obj.to_dict()
+            'property': property_data
         }), 200
         
     except Exception as e:
+        db.session.rollback()
         return jsonify({
             'success': False,
             'error': str(e)
@@ -91,8 +281,14 @@ def get_property(property_id):
 def get_properties_by_owner(owner_id):
     """Get all properties owned by a specific user"""
     try:
-        # Query properties by owner_id
-        properties = Property.query.filter_by(owner_id=owner_id).order_by(Property.date_added.desc()).all()
+        stmt = lambda_stmt(lambda: select(Property).where(Property.owner_id == owner_id))
+        
+        # ?count_only=1 returns just the number of matches, without loading any rows
+        if request.args.get('count_only'):
+            return jsonify({'success': True, 'count': _count_matches(stmt)}), 200
+        
+        # Query one page of properties by owner_id
+        properties, pagination = _paginate(stmt)
         
         # Convert to dictionary format
         properties_data = [prop.to_dict() for prop in properties]
@@ -100,9 +296,15 @@ def get_properties_by_owner(owner_id):
         return jsonify({
             'success': True,
             'properties': properties_data,
-            'count': len(properties_data)
+            'count': len(properties_data),
+            'pagination': pagination
         })
         
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'Invalid before cursor'
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -171,7 +373,7 @@ def update_property(property_id):
                 'error': 'Authentication required'
             }), 401
         
-        property_obj = Property.query.get(property_id)
+        property_obj = db.session.get(Property, property_id)
         
         if not property_obj:
             return jsonify({
@@ -224,7 +426,10 @@ def delete_property(property_id):
                 'error': 'Authentication required'
             }), 401
         
-        property_obj = Property.query.get(property_id)
+        # Only the ownership check needs a column; the delete cascades load the rest
+        property_obj = Property.query.options(
+            load_only(Property.id, Property.owner_id)
+        ).filter_by(id=property_id).first()
         
         if not property_obj:
             return jsonify({
@@ -259,7 +464,7 @@ def delete_property(property_id):
 def inquire_property(property_id):
     """Increment inquiry count for a property"""
     try:
-        property_obj = Property.query.get(property_id)
+        property_obj = db.session.get(Property, property_id)
         
         if not property_obj:
             return jsonify({
@@ -267,13 +472,13 @@ def inquire_property(property_id):
                 'error': 'Property not found'
             }), 404
         
-        # Increment inquiry count
-        property_obj.inquiries += 1
-        db.session.commit()
+        # Buffered like views and flushed by the scheduler
+        property_data = property_obj.to_dict()
+        property_data['inquiries'] += property_counter_service.record(property_id, 'inquiries')
         
         return jsonify({
             'success': True,
-            'property': property_obj.to_dict(),
+            'property': property_data,
             'message': 'Inquiry recorded successfully'
         }), 200
         
@@ -302,59 +507,82 @@ def search_properties():
         cooking_ready = request.args.get('cooking_ready', type=bool)
         hot_property = request.args.get('hot_property', type=bool)
         
+        # Echoed back with the results
+        search_params = {
+            'query': query_text,
+            'location': location,
+            'min_price': min_price,
+            'max_price': max_price,
+            'bedrooms': bedrooms,
+            'bathrooms': bathrooms,
+            'property_type': property_type,
+            'furnished': furnished,
+            'amenities': amenities,
+            'zero_deposit': zero_deposit,
+            'cooking_ready': cooking_ready,
+            'hot_property': hot_property
+        }
+        
+        # Impossible filter combinations can't match anything; skip the database
+        if _matches_nothing(min_price, max_price, bedrooms, bathrooms):
+            return jsonify({
+                'success': True,
+                'properties': [],
+                'count': 0,
+                'pagination': _empty_page(),
+                'search_params': search_params
+            }), 200
+        
         # Start with base query - only show Active properties for public search
-        query = Property.query.filter(Property.status == 'Active')
+        stmt = lambda_stmt(lambda: select(Property).where(Property.status == PropertyStatus.ACTIVE))
         
-        # Text search in title and description
+        # Text search in title, description and location
         if query_text:
-            query = query.filter(
-                db.or_(
-                    Property.title.ilike(f'%{query_text}%'),
-                    Property.description.ilike(f'%{query_text}%'),
-                    Property.location.ilike(f'%{query_text}%')
-                )
-            )
+            stmt = _filter_by_text(stmt, query_text)
         
         # Location filter
         if location:
-            query = query.filter(Property.location.ilike(f'%{location}%'))
+            location_pattern = f'%{location}%'
+            stmt += lambda s: s.where(Property.location.ilike(location_pattern))
         
         # Price range filter
         if min_price is not None:
-            query = query.filter(Property.price >= min_price)
+            stmt += lambda s: s.where(Property.price >= min_price)
         if max_price is not None:
-            query = query.filter(Property.price <= max_price)
+            stmt += lambda s: s.where(Property.price <= max_price)
         
         # Room filters
         if bedrooms is not None:
-            query = query.filter(Property.bedrooms == bedrooms)
+            stmt += lambda s: s.where(Property.bedrooms == bedrooms)
         if bathrooms is not None:
-            query = query.filter(Property.bathrooms == bathrooms)
+            stmt += lambda s: s.where(Property.bathrooms == bathrooms)
         
         # Property type filter
         if property_type:
-            query = query.filter(Property.property_type == property_type)
+            stmt += lambda s: s.where(Property.property_type == property_type)
         
         # Furnished filter
         if furnished:
-            query = query.filter(Property.furnished == furnished)
+            stmt += lambda s: s.where(Property.furnished == furnished)
         
         # Special features filters
         if zero_deposit is not None:
-            query = query.filter(Property.zero_deposit == zero_deposit)
+            stmt += lambda s: s.where(Property.zero_deposit == zero_deposit)
         if cooking_ready is not None:
-            query = query.filter(Property.cooking_ready == cooking_ready)
+            stmt += lambda s: s.where(Property.cooking_ready == cooking_ready)
         if hot_property is not None:
-            query = query.filter(Property.hot_property == hot_property)
+            stmt += lambda s: s.where(Property.hot_property == hot_property)
         
         # Amenities filter
         if amenities:
-            amenity_list = [a.strip() for a in amenities.split(',')]
-            for amenity in amenity_list:
-                query = query.filter(Property.amenities.like(f'%{amenity}%'))
+            stmt = _filter_by_amenities(stmt, amenities)
         
-        # Execute query
-        properties = query.order_by(Property.date_added.desc()).all()
+        # ?count_only=1 returns just the number of matches, without loading any rows
+        if request.args.get('count_only'):
+            return jsonify({'success': True, 'count': _count_matches(stmt)}), 200
+        
+        # Fetch one page of results
+        properties, pagination = _paginate(stmt)
         
         # Convert to dictionary format
         properties_data = [prop.to_dict() for prop in properties]
@@ -363,22 +591,15 @@ def search_properties():
             'success': True,
             'properties': properties_data,
             'count': len(properties_data),
-            'search_params': {
-                'query': query_text,
-                'location': location,
-                'min_price': min_price,
-                'max_price': max_price,
-                'bedrooms': bedrooms,
-                'bathrooms': bathrooms,
-                'property_type': property_type,
-                'furnished': furnished,
-                'amenities': amenities,
-                'zero_deposit': zero_deposit,
-                'cooking_ready': cooking_ready,
-                'hot_property': hot_property
-            }
+            'pagination': pagination,
+            'search_params': search_params
         }), 200
         
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'Invalid before cursor'
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -386,38 +607,15 @@ def search_properties():
         }), 500
 
 @property_bp.route('/properties/stats', methods=['GET'])
+@cached_property_list
 def get_property_stats():
     """Get property statistics"""
     try:
-        total_properties = Property.query.count()
-        active_properties = Property.query.filter_by(status='Active').count()
-        total_views = db.session.query(db.func.sum(Property.views)).scalar() or 0
-        total_inquiries = db.session.query(db.func.sum(Property.inquiries)).scalar() or 0
-        
-        # Property type distribution
-        property_types = db.session.query(
-            Property.property_type,
-            db.func.count(Property.id)
-        ).group_by(Property.property_type).all()
-        
-        # Price range distribution
-        price_ranges = {
-            'under_1000': Property.query.filter(Property.price < 1000).count(),
-            '1000_2000': Property.query.filter(Property.price.between(1000, 2000)).count(),
-            '2000_3000': Property.query.filter(Property.price.between(2000, 3000)).count(),
-            'over_3000': Property.query.filter(Property.price > 3000).count()
-        }
-        
+        # Aggregates are cached and refreshed by the background scheduler; the
+        # serialized response is also cached with an ETag like the listings
         return jsonify({
             'success': True,
-            'stats': {
-                'total_properties': total_properties,
-                'active_properties': active_properties,
-                'total_views': total_views,
-                'total_inquiries': total_inquiries,
-                'property_types': dict(property_types),
-                'price_ranges': price_ranges
-            }
+            'stats': property_stats_service.get_property_stats()
         }), 200
         
     except Exception as e:
@@ -429,6 +627,7 @@ def get_property_stats():
 
 
 @property_bp.route('/properties/favorites', methods=['GET'])
+@cached_property_list
 def get_properties_for_favorites():
     """Get properties for tenant favorites - includes Active and Rented properties"""
     try:
@@ -439,33 +638,51 @@ def get_properties_for_favorites():
         bedrooms = request.args.get('bedrooms', type=int)
         property_type = request.args.get('property_type')
         amenities = request.args.get('amenities')  # Comma-separated list
+        ids = [int(i) for i in request.args.get('ids', '').split(',') if i.strip().isdigit()]
+        
+        # Impossible filter combinations can't match anything; skip the database
+        if _matches_nothing(min_price, max_price, bedrooms):
+            return jsonify({
+                'success': True,
+                'properties': [],
+                'count': 0,
+                'pagination': _empty_page()
+            }), 200
         
         # Start with base query - show Active and Rented properties (exclude only Inactive)
-        query = Property.query.filter(Property.status.in_(['Active', 'Rented']))
+        favorite_statuses = Property.status.in_([PropertyStatus.ACTIVE, PropertyStatus.RENTED])
+        stmt = lambda_stmt(lambda: select(Property).where(favorite_statuses))
+        
+        # Only the tenant's favourites, when the ids are given
+        if ids:
+            stmt += lambda s: s.where(Property.id.in_(ids))
         
         # Apply filters
         if location:
-            query = query.filter(Property.location.ilike(f'%{location}%'))
+            location_pattern = f'%{location}%'
+            stmt += lambda s: s.where(Property.location.ilike(location_pattern))
         
         if min_price is not None:
-            query = query.filter(Property.price >= min_price)
+            stmt += lambda s: s.where(Property.price >= min_price)
         
         if max_price is not None:
-            query = query.filter(Property.price <= max_price)
+            stmt += lambda s: s.where(Property.price <= max_price)
         
         if bedrooms is not None:
-            query = query.filter(Property.bedrooms == bedrooms)
+            stmt += lambda s: s.where(Property.bedrooms == bedrooms)
         
         if property_type:
-            query = query.filter(Property.property_type == property_type)
+            stmt += lambda s: s.where(Property.property_type == property_type)
         
         if amenities:
-            amenity_list = [a.strip() for a in amenities.split(',')]
-            for amenity in amenity_list:
-                query = query.filter(Property.amenities.like(f'%{amenity}%'))
+            stmt = _filter_by_amenities(stmt, amenities)
+        
+        # ?count_only=1 returns just the number of matches, without loading any rows
+        if request.args.get('count_only'):
+            return jsonify({'success': True, 'count': _count_matches(stmt)}), 200
         
-        # Execute query and get results
-        properties = query.order_by(Property.date_added.desc()).all()
+        # Fetch one page of results
+        properties, pagination = _paginate(stmt)
         
         # Convert to dictionary format
         properties_data = [prop.to_dict() for prop in properties]
@@ -473,9 +690,15 @@ def get_properties_for_favorites():
         return jsonify({
             'success': True,
             'properties': properties_data,
-            'count': len(properties_data)
+            'count': len(properties_data),
+            'pagination': pagination
         }), 200
         
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'Invalid before cursor'
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -488,28 +711,24 @@ def get_properties_for_favorites():
 def add_recurring_availability(property_id):
     """Add recurring availability for a property"""
     try:
-        # Debug session information
-        print(f"Session data: {dict(session)}")
-        print(f"User ID in session: {session.get('user_id')}")
-        
         # Check if user is logged in
         if 'user_id' not in session:
-            print("Authentication failed: No user_id in session")
+            logger.debug("Recurring availability rejected: no user_id in session")
             return jsonify({
                 'success': False,
                 'error': 'Authentication required. Please log in first.'
             }), 401
         
-        # Get the property and verify ownership
-        property_obj = Property.query.get(property_id)
-        if not property_obj:
+        # Verify the property exists and the user owns it; only owner_id is needed
+        landlord_id = _property_owner_id(property_id)
+        if landlord_id is None:
             return jsonify({
                 'success': False,
                 'error': 'Property not found'
             }), 404
         
         # Verify the user owns this property
-        if property_obj.owner_id != session['user_id']:
+        if landlord_id != session['user_id']:
             return jsonify({
                 'success': False,
                 'error': 'You can only set availability for your own properties'
@@ -549,6 +768,13 @@ def add_recurring_availability(property_id):
                 'error': 'End date must be after start date'
             }), 400
         
+        # Bound the number of slots one request can create
+        if (end_date - start_date).days > MAX_AVAILABILITY_DAYS:
+            return jsonify({
+                'success': False,
+                'error': f'Date range cannot exceed {MAX_AVAILABILITY_DAYS} days'
+            }), 400
+        
         # Validate schedule data
         schedule = data['schedule']
         if not isinstance(schedule, dict) or not schedule:
@@ -557,91 +783,24 @@ def add_recurring_availability(property_id):
                 'error': 'Schedule must be a non-empty object'
             }), 400
         
-        # Day name to weekday number mapping
-        # Frontend calendar: ['Sun', 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat']
-        # Python weekday(): Monday=0, Tuesday=1, ..., Saturday=5, Sunday=6
-        # We need to map frontend day names to Python weekday numbers
-        day_mapping = {
-            'sunday': 6,    # Python: Sunday = 6
-            'monday': 0,    # Python: Monday = 0
-            'tuesday': 1,   # Python: Tuesday = 1
-            'wednesday': 2, # Python: Wednesday = 2
-            'thursday': 3,  # Python: Thursday = 3
-            'friday': 4,    # Python: Friday = 4
-            'saturday': 5   # Python: Saturday = 5
-        }
+        # Resolve the schedule to weekday -> (from, to) once, not per date
+        schedule_by_weekday = ViewingSlot.schedule_by_weekday(schedule)
         
-        # Clear existing viewing slots for this property in the date range
-        print(f"Clearing existing slots for property {property_id} from {start_date} to {end_date}")
-        existing_slots = ViewingSlot.query.filter(
-            ViewingSlot.property_id == property_id,
+        # Clear existing unbooked viewing slots in the date range with a single DELETE.
+        # Viewing slots belong to the landlord, not the individual property, and
+        # booked slots are kept because bookings reference them.
+        ViewingSlot.query.filter(
+            ViewingSlot.landlord_id == landlord_id,
             ViewingSlot.date >= start_date,
-            ViewingSlot.date <= end_date
-        ).all()
-        
-        for slot in existing_slots:
-            db.session.delete(slot)
-        
-        print(f"Deleted {len(existing_slots)} existing slots")
-        
-        slots_created = 0
-        
-        # Iterate through each date in the range
-        current_date = start_date
-        while current_date <= end_date:
-            # Get the day of the week
-            weekday = current_date.weekday()
-            print(f"Checking {current_date} (Weekday is {weekday})")
-            
-            # Check if this day is in the schedule
-            day_found = False
-            for day_name, day_config in schedule.items():
-                if day_name.lower() in day_mapping and day_mapping[day_name.lower()] == weekday:
-                    day_found = True
-                    print(f"Found schedule for {day_name} on {current_date}")
-                    try:
-                        from_time = datetime.strptime(day_config['from'], '%H:%M').time()
-                        to_time = datetime.strptime(day_config['to'], '%H:%M').time()
-
-                        if to_time <= from_time:
-                            continue
-
-                        start_datetime = datetime.combine(current_date, from_time)
-                        end_datetime = datetime.combine(current_date, to_time)
-
-                        current_slot_start = start_datetime
-                        while current_slot_start < end_datetime:
-                            current_slot_end = current_slot_start + timedelta(minutes=30)
-
-                            if current_slot_end > end_datetime:
-                                break
-
-                            # Create the slot directly without checking if it exists
-                            new_slot = ViewingSlot(
-                                property_id=property_id,
-                                date=current_slot_start.date(),
-                                start_time=current_slot_start.time(),
-                                end_time=current_slot_end.time(),
-                                is_available=True
-                            )
-                            db.session.add(new_slot)
-                            slots_created += 1
-                            print(f"Created slot: {current_slot_start.date()} ({current_slot_start.strftime('%A')}) {current_slot_start.time()} - {current_slot_end.time()}")
-
-                            current_slot_start = current_slot_end
-
-                    except (ValueError, KeyError) as e:
-                        print(f"Error processing {day_name}: {e}")
-                        continue
-                    break  # Only process one matching day per date
-            
-            if not day_found:
-                print(f"No schedule found for {current_date} (weekday {weekday})")
-            
-            # Move to next date
-            current_date += timedelta(days=1)
+            ViewingSlot.date <= end_date,
+            ViewingSlot.is_available == True
+        ).delete(synchronize_session=False)
         
-        # Commit all the new slots
+        # Create the new slots in one INSERT; booked slots kept by the clear
+        # are skipped by the database
+        slots_created = ViewingSlot.create_schedule_slots(
+            landlord_id, start_date, end_date, schedule_by_weekday
+        )
         db.session.commit()
         
         return jsonify({
@@ -665,25 +824,29 @@ def add_recurring_availability(property_id):
 def get_available_slots(property_id):
     """Fetch all available, non-booked viewing slots for a property's landlord."""
     try:
-        # Step 1: Find the property to identify its owner (the landlord)
-        prop = Property.query.get(property_id)
-        if not prop:
-            return jsonify({'success': False, 'error': 'Property not found'}), 404
+        # Find the upcoming available slots of the property's landlord in one
+        # statement by joining through the owner. Past slots can't be booked, so
+        # they are left out rather than growing the list forever
+        slots = ViewingSlot.query.join(
+            Property, Property.owner_id == ViewingSlot.landlord_id
+        ).filter(
+            Property.id == property_id,
+            ViewingSlot.is_available == True,
+            ViewingSlot.date >= date.today()
+        ).options(*strict_loading()).order_by(
+            ViewingSlot.date, ViewingSlot.start_time
+        ).yield_per(SLOT_STREAM_BATCH_SIZE)
 
-        landlord_id = prop.owner_id
-
-        # Step 2: Find all available slots belonging to that landlord for this specific property
-        slots = ViewingSlot.query.filter(
-            ViewingSlot.landlord_id == landlord_id,
-            ViewingSlot.is_available == True
-        ).order_by(ViewingSlot.date, ViewingSlot.start_time).all()
-
-        slots_data = [slot.to_dict() for slot in slots]
+        # Fetching the first row runs the query inside this try. No rows is
+        # either no slots or no property; only then check which
+        first_slot, slots = peek(slots)
+        if first_slot is None and _property_owner_id(property_id) is None:
+            return jsonify({'success': False, 'error': 'Property not found'}), 404
 
-        return jsonify({
-            'success': True,
-            'slots': slots_data
-        }), 200
+        # Stream the list: a landlord can publish months of half-hour slots, so
+        # rows are fetched from a server-side cursor in batches and written out
+        # one at a time instead of building every dict and the whole JSON string
+        return stream_json_list('slots', slots)
 
     except Exception as e:
         return jsonify({
@@ -714,7 +877,7 @@ def update_property_status(property_id):
             return jsonify({'success': False, 'error': f'Invalid status: {new_status_str}'}), 400
         
         # Get the property
-        property_obj = Property.query.get(property_id)
+        property_obj = db.session.get(Property, property_id)
         if not property_obj:
             return jsonify({'success': False, 'error': 'Property not found'}), 404
         
@@ -773,7 +936,7 @@ def reactivate_property(property_id):
     """Reactivate an inactive property (Inactive → Active)"""
     try:
         # Get the property
-        property_obj = Property.query.get(property_id)
+        property_obj = db.session.get(Property, property_id)
         if not property_obj:
             return jsonify({'success': False, 'error': 'Property not found'}), 404
         
@@ -819,7 +982,7 @@ def deactivate_property(property_id):
     """Deactivate a property (Any status → Inactive)"""
     try:
         # Get the property
-        property_obj = Property.query.get(property_id)
+        property_obj = db.session.get(Property, property_id)
         if not property_obj:
             return jsonify({'success': False, 'error': 'Property not found'}), 404
         
@@ -881,7 +1044,7 @@ def relist_property(property_id):
             return jsonify({'success': False, 'error': 'Available date must be in the future'}), 400
         
         # Get the property
-        property_obj = Property.query.get(property_id)
+        property_obj = db.session.get(Property, property_id)
         if not property_obj:
             return jsonify({'success': False, 'error': 'Property not found'}), 404
         
@@ -927,8 +1090,11 @@ def relist_property(property_id):
 def get_property_status(property_id):
     """Get detailed property status information"""
     try:
-        # Get the property
-        property_obj = Property.query.get(property_id)
+        # Get the property; only the status columns are read
+        property_obj = Property.query.options(load_only(
+            Property.id, Property.owner_id, Property.status,
+            Property.available_from_date, Property.date_updated
+        )).filter_by(id=property_id).first()
         if not property_obj:
             return jsonify({'success': False, 'error': 'Property not found'}), 404
         
@@ -1,13 +1,16 @@
 from flask import Blueprint, request, jsonify, session
-from datetime import datetime, timedelta
+from datetime import datetime
+import logging
 
 from ..models.booking import Booking
-from ..models.viewing_slot import ViewingSlot
+from ..models.viewing_slot import ViewingSlot, MAX_AVAILABILITY_DAYS
 from ..models.property import Property
 from ..models.user import db
 
 landlord_bp = Blueprint('landlord', __name__)
 
+logger = logging.getLogger(__name__)
+
 
 @landlord_bp.route('/landlord/<int:landlord_id>/recurring-availability', methods=['POST'])
 def add_landlord_recurring_availability(landlord_id):
@@ -33,16 +36,18 @@ def add_landlord_recurring_availability(landlord_id):
         if end_date <= start_date:
             return jsonify({'success': False, 'error': 'End date must be after start date'}), 400
 
+        # Bound the number of slots one request can create
+        if (end_date - start_date).days > MAX_AVAILABILITY_DAYS:
+            return jsonify({'success': False, 'error': f'Date range cannot exceed {MAX_AVAILABILITY_DAYS} days'}), 400
+
         if not isinstance(schedule, dict):
             return jsonify({'success': False, 'error': 'Schedule must be a valid object'}), 400
 
-        day_mapping = {
-            'sunday': 6, 'monday': 0, 'tuesday': 1, 'wednesday': 2,
-            'thursday': 3, 'friday': 4, 'saturday': 5
-        }
+        # Resolve the schedule to weekday -> (from, to) once, not per date or booking
+        schedule_by_weekday = ViewingSlot.schedule_by_weekday(schedule)
 
         # --- NEW: CONFLICT DETECTION LOGIC ---
-        print("--- Checking for conflicts with confirmed bookings... ---")
+        logger.debug("Checking for conflicts with confirmed bookings")
         conflicting_bookings = []
 
         # 1. Find all properties owned by this landlord
@@ -58,21 +63,9 @@ def add_landlord_recurring_availability(landlord_id):
 
         # 3. Check each booking against the NEW proposed schedule.
         for booking in all_bookings_in_range:
-            booking_weekday = booking.appointment_date.weekday()
-            is_now_unavailable = True
-
-            for day_name, day_config in schedule.items():
-                if day_mapping.get(day_name.lower()) == booking_weekday:
-                    # The day is still in the schedule, now check the time.
-                    try:
-                        from_time = datetime.strptime(day_config['from'], '%H:%M').time()
-                        to_time = datetime.strptime(day_config['to'], '%H:%M').time()
-                        if from_time <= booking.appointment_time < to_time:
-                            # The booking is still valid within the new time slot.
-                            is_now_unavailable = False
-                            break
-                    except (ValueError, KeyError):
-                        continue
+            day_hours = schedule_by_weekday.get(booking.appointment_date.weekday())
+            # The booking is still valid if its day is in the schedule and its time in the new hours
+            is_now_unavailable = not (day_hours and day_hours[0] <= booking.appointment_time < day_hours[1])
 
             if is_now_unavailable:
                 # This booking is no longer valid under the new schedule
@@ -80,7 +73,7 @@ def add_landlord_recurring_availability(landlord_id):
 
         # 4. If any conflicts were found, stop and return them to the frontend.
         if conflicting_bookings:
-            print(f"--- CONFLICT DETECTED: {len(conflicting_bookings)} bookings are affected. ---")
+            logger.debug("Conflict detected: %d bookings are affected", len(conflicting_bookings))
             return jsonify({
                 'success': False,
                 'error': 'New availability conflicts with existing confirmed bookings.',
@@ -90,49 +83,18 @@ def add_landlord_recurring_availability(landlord_id):
         # --- END OF CONFLICT DETECTION ---
 
         # --- MODIFIED: Only delete UNBOOKED slots ---
-        print(f"Clearing existing UNBOOKED slots for landlord {landlord_id} from {start_date} to {end_date}")
+        logger.debug("Clearing existing unbooked slots for landlord %s from %s to %s", landlord_id, start_date, end_date)
         ViewingSlot.query.filter(
             ViewingSlot.landlord_id == landlord_id,
             ViewingSlot.date >= start_date,
             ViewingSlot.date <= end_date,
             ViewingSlot.is_available == True  # This is the crucial change
-        ).delete()
-
-        # --- Slot Creation Logic (same as your original code) ---
-        slots_created = 0
-        current_date = start_date
-        while current_date <= end_date:
-            weekday = current_date.weekday()
-            for day_name, day_config in schedule.items():
-                if day_mapping.get(day_name.lower()) == weekday:
-                    try:
-                        from_time = datetime.strptime(day_config['from'], '%H:%M').time()
-                        to_time = datetime.strptime(day_config['to'], '%H:%M').time()
-
-                        if to_time <= from_time: continue
-
-                        start_datetime = datetime.combine(current_date, from_time)
-                        end_datetime = datetime.combine(current_date, to_time)
-
-                        current_slot_start = start_datetime
-                        while current_slot_start < end_datetime:
-                            current_slot_end = current_slot_start + timedelta(minutes=30)
-                            if current_slot_end > end_datetime: break
-
-                            new_slot = ViewingSlot(
-                                landlord_id=landlord_id,
-                                date=current_slot_start.date(),
-                                start_time=current_slot_start.time(),
-                                end_time=current_slot_end.time(),
-                                is_available=True
-                            )
-                            db.session.add(new_slot)
-                            slots_created += 1
-                            current_slot_start = current_slot_end
-                    except (ValueError, KeyError):
-                        continue
-            current_date += timedelta(days=1)
+        ).delete(synchronize_session=False)
 
+        # --- Slot Creation: one INSERT, booked slots kept above are skipped by the database ---
+        slots_created = ViewingSlot.create_schedule_slots(
+            landlord_id, start_date, end_date, schedule_by_weekday
+        )
         db.session.commit()
 
         return jsonify({
@@ -0,0 +1,55 @@
+"""
+Streaming JSON list responses
+
+Long lists are written out row by row from a server-side cursor instead of
+building every dict and the whole JSON string in memory. The 200 status goes
+out before the rows do, so callers fetch the first row up front (peek) to let
+query errors reach their normal JSON error handling, and a failure after that
+closes the array with "success": false rather than truncating the body.
+"""
+
+import logging
+from itertools import chain
+
+from flask import Response, current_app, stream_with_context
+
+logger = logging.getLogger(__name__)
+
+
+def peek(rows):
+    """
+    Fetch the first row now and return (first_row, rows), where rows still
+    yields every row including the first. first_row is None if there are none.
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return None, iter(())
+    return first, chain((first,), rows)
+
+
+def stream_json_list(key, rows):
+    """
+    Stream {"<key>": [row.to_dict(), ...], "success": true}.
+
+    If reading the rows fails part way the body ends with "success": false and
+    an "error" message, so clients can tell a cut-short list from a full one.
+    """
+    def generate():
+        dumps = current_app.json.dumps
+        yield f'{{"{key}":['
+        try:
+            for i, row in enumerate(rows):
+                # Serialize before writing the separator so a failure can't
+                # leave a dangling comma
+                item = dumps(row.to_dict())
+                yield ',' + item if i else item
+        except Exception as e:
+            # The session is rolled back when the app context closes, after
+            # the cursor; rolling back here would invalidate it first
+            logger.error(f"Error streaming {key}: {str(e)}")
+            yield '],"error":' + dumps(f'Failed to load {key}') + ',"success":false}'
+            return
+        yield '],"success":true}'
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
@@ -231,7 +231,6 @@ def create_agreement_from_application():
             
             # Agreement terms
             monthly_rent=property_obj.price,
-            security_deposit=property_obj.price * 2,  # Default to 2 months rent
             lease_start_date=lease_start_date,
             lease_end_date=lease_end_date,
             lease_duration_months=lease_duration_months,
@@ -261,6 +260,7 @@ def create_agreement_from_application():
             # Set expiry to 48 hours from creation if not completed
             expires_at=expires_at_time
         )
+        agreement.set_deposit_amounts()
         
         db.session.add(agreement)
         db.session.commit()
@@ -589,7 +589,7 @@ def preview_agreement(agreement_id):
         if agreement.tenant_id != user_id and agreement.landlord_id != user_id:
             return jsonify({'success': False, 'error': 'Unauthorized access'}), 403
 
-        agreement_property = Property.query.get(agreement.property_id)
+        agreement_property = db.session.get(Property, agreement.property_id)
         if not property:
             return jsonify({'success': False, 'error': 'Associated property not found'}), 404
         
@@ -778,7 +778,7 @@ def withdraw_landlord_offer(agreement_id):
         agreement.status = 'withdrawn'
         
         # Revert property from Pending back to Active when landlord withdraws offer
-        property_obj = Property.query.get(agreement.property_id)
+        property_obj = db.session.get(Property, agreement.property_id)
         if property_obj and property_obj.status == PropertyStatus.PENDING:
             if property_obj.transition_to_active():
                 logger.info(f"Property {property_obj.id} reverted to Active status after landlord withdrawal")
@@ -873,7 +873,7 @@ def check_agreement_expiry(agreement_id):
             agreement.cancellation_reason = 'Agreement expired - not completed within time limit'
             
             # Revert property from Pending back to Active when agreement expires
-            property_obj = Property.query.get(agreement.property_id)
+            property_obj = db.session.get(Property, agreement.property_id)
             if property_obj and property_obj.status == PropertyStatus.PENDING:
                 if property_obj.transition_to_active():
                     logger.info(f"Property {property_obj.id} reverted to Active status after agreement expiration")
@@ -6,9 +6,11 @@ Handles webhooks from SignWell, Stripe, and other external services
 from flask import Blueprint, request, jsonify
 import logging
 
+from ..models.user import db
 from ..services.signwell_service import signwell_service
 from ..services.stripe_service import stripe_service
 from ..services.workflow_coordinator import workflow_coordinator
+from ..services.deposit_service import DepositService
 
 logger = logging.getLogger(__name__)
 
@@ -79,13 +81,27 @@ def stripe_webhook():
             if event_type == 'payment_intent.succeeded':
                 payment_intent = event['data']['object']
                 payment_intent_id = payment_intent['id']
+                metadata = payment_intent.get('metadata') or {}
                 
-                # Handle payment completion
-                completion_result = workflow_coordinator.handle_payment_completion(payment_intent_id)
-                
-                if not completion_result['success']:
-                    logger.error(f"Failed to handle payment completion: {completion_result['error']}")
-                    # Don't return error to Stripe - we've acknowledged the webhook
+                if metadata.get('payment_type') == 'deposit' and metadata.get('agreement_id'):
+                    # Record the deposit before acknowledging: if it fails, a 5xx
+                    # makes Stripe redeliver the event instead of losing it
+                    try:
+                        DepositService().complete_deposit_from_webhook(
+                            int(metadata['agreement_id']),
+                            payment_intent_id
+                        )
+                    except Exception as e:
+                        db.session.rollback()
+                        logger.error(f"Failed to record deposit payment {payment_intent_id}: {str(e)}")
+                        return jsonify({'error': 'Failed to record deposit payment'}), 500
+                else:
+                    # Handle payment completion
+                    completion_result = workflow_coordinator.handle_payment_completion(payment_intent_id)
+                    
+                    if not completion_result['success']:
+                        logger.error(f"Failed to handle payment completion: {completion_result['error']}")
+                        # Don't return error to Stripe - we've acknowledged the webhook
                     
         except Exception as e:
             logger.error(f"Error processing Stripe webhook event: {str(e)}")
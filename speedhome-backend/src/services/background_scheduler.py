@@ -4,6 +4,7 @@ Background Job Scheduler
 Handles scheduling and execution of background jobs for the property lifecycle system.
 """
 
+import atexit
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
@@ -14,6 +15,8 @@ import threading
 from datetime import datetime, timedelta
 # Use full property lifecycle service now that deposit models are working
 from src.services.property_lifecycle_service import PropertyLifecycleService
+from src.services.property_stats_service import PROPERTY_STATS_CACHE_TTL, refresh_property_stats
+from src.services import property_counter_service
 from src.models.user import db
 import logging
 
@@ -28,6 +31,7 @@ class BackgroundScheduler:
         self.app = app
         self.running = False
         self.scheduler_thread = None
+        self._exit_flush_registered = False
         
     def init_app(self, app):
         """Initialize the scheduler with Flask app context"""
@@ -46,6 +50,17 @@ class BackgroundScheduler:
         # Schedule hourly checks for immediate needs (optional)
         schedule.every(10).minutes.do(self._run_hourly_checks)
         
+        # Keep the cached property stats warm so the endpoint never scans the table
+        schedule.every(PROPERTY_STATS_CACHE_TTL // 60).minutes.do(self._refresh_property_stats)
+        
+        # Write buffered property view/inquiry counts in one batch, and whatever
+        # is still buffered when the process exits
+        schedule.every(property_counter_service.COUNTER_FLUSH_INTERVAL).seconds.do(self._flush_property_counters)
+        property_counter_service.start_buffering()
+        if not self._exit_flush_registered:
+            atexit.register(self._flush_property_counters)
+            self._exit_flush_registered = True
+        
         self.running = True
         self.scheduler_thread = threading.Thread(target=self._run_scheduler, daemon=True)
         self.scheduler_thread.start()
@@ -64,6 +79,11 @@ class BackgroundScheduler:
         if self.scheduler_thread:
             self.scheduler_thread.join(timeout=5)
             
+        # Write counts directly from now on, and don't drop those buffered
+        # since the last flush
+        property_counter_service.stop_buffering()
+        self._flush_property_counters()
+        
         schedule.clear()
         logger.info("✅ Background scheduler stopped")
         
@@ -74,7 +94,7 @@ class BackgroundScheduler:
         while self.running:
             try:
                 schedule.run_pending()
-                time.sleep(60)  # Check every minute
+                time.sleep(property_counter_service.COUNTER_FLUSH_INTERVAL)  # Fast enough for the counter flush
             except Exception as e:
                 logger.error(f"❌ Error in scheduler loop: {str(e)}")
                 time.sleep(60)  # Continue running even if there's an error
@@ -143,6 +163,30 @@ class BackgroundScheduler:
             except Exception as e:
                 logger.error(f"❌ Exception during hourly checks: {str(e)}")
                 
+    def _refresh_property_stats(self):
+        """Recompute the cached property stats with Flask app context"""
+        if not self.app:
+            logger.error("❌ No Flask app context available for property stats refresh")
+            return
+            
+        with self.app.app_context():
+            try:
+                refresh_property_stats()
+            except Exception as e:
+                logger.error(f"❌ Exception during property stats refresh: {str(e)}")
+                
+    def _flush_property_counters(self):
+        """Write buffered property view/inquiry counts with Flask app context"""
+        if not self.app:
+            logger.error("❌ No Flask app context available for property counter flush")
+            return
+            
+        with self.app.app_context():
+            try:
+                property_counter_service.flush()
+            except Exception as e:
+                logger.error(f"❌ Exception during property counter flush: {str(e)}")
+                
     def run_maintenance_now(self):
         """Run maintenance tasks immediately (for testing/manual execution)"""
         if not self.app:
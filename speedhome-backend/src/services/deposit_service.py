@@ -5,14 +5,23 @@ Integrates with the existing tenancy agreement workflow
 
 from ..models.user import db
 from ..models.deposit_transaction import DepositTransaction, DepositTransactionStatus
-from ..models.tenancy_agreement import TenancyAgreement
+from ..models.tenancy_agreement import TenancyAgreement, calculate_deposit_amounts
 from ..models.property import Property
 from ..models.user import User
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import joinedload
 from datetime import datetime, timedelta
+from decimal import Decimal, ROUND_HALF_UP
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Security deposit months for property types that differ from the standard 2
+SECURITY_DEPOSIT_MONTHS = {
+    'luxury': Decimal('2.5'),
+    'commercial': Decimal('3'),
+}
+
 class DepositService:
     """Service for managing deposit transactions and integration with tenancy agreements"""
     
@@ -55,18 +64,17 @@ class DepositService:
                 }
             
             # Get property and calculate deposit amounts
-            property_obj = Property.query.get(agreement.property_id)
+            property_obj = db.session.get(Property, agreement.property_id)
             if not property_obj:
                 return {
                     'success': False,
                     'error': 'Property not found'
                 }
             
-            # Calculate Malaysian 2-month deposit standard
-            monthly_rent = float(agreement.monthly_rent) if agreement.monthly_rent else 0.0
-            
-            # Standard Malaysian deposit calculation
-            total_amount = monthly_rent * 2.5  # 2 months security + 0.5 month utility
+            # Standard Malaysian deposit: 2 months security + 0.5 month utility,
+            # kept as Decimal to match the Numeric columns
+            monthly_rent = agreement.monthly_rent or Decimal('0')
+            _, _, total_amount = agreement.get_deposit_amounts()
             
             # Create the deposit transaction
             deposit = DepositTransaction(
@@ -78,7 +86,7 @@ class DepositService:
                 # Deposit amounts (using correct column names)
                 amount=total_amount,
                 calculation_base=monthly_rent,
-                calculation_multiplier=2.5,
+                calculation_multiplier=Decimal('2.5'),
                 
                 # Status and dates
                 status=DepositTransactionStatus.HELD_IN_ESCROW,
@@ -88,6 +96,7 @@ class DepositService:
                 escrow_status='held',
                 escrow_held_at=datetime.utcnow()
             )
+            deposit.snapshot_agreement_details(agreement)
             
             # Save to database
             db.session.add(deposit)
@@ -109,6 +118,98 @@ class DepositService:
                 'error': f'Failed to create deposit: {str(e)}'
             }
     
+    def record_stripe_deposit_payment(self, agreement, payment_intent_id):
+        """
+        Record a verified Stripe deposit payment and activate the agreement
+        
+        Upserts the deposit transaction, activates the agreement and moves the
+        property to Rented. The caller loads the agreement (with its property)
+        and checks it is awaiting deposit payment; this method commits.
+        
+        Args:
+            agreement: TenancyAgreement in website_fee_paid status
+            payment_intent_id (str): ID of the succeeded PaymentIntent
+            
+        Returns:
+            int: ID of the deposit transaction
+        """
+        # Create or update the deposit transaction in one statement; the unique
+        # constraint on tenancy_agreement_id also makes concurrent completions safe
+        _, _, total_amount = agreement.get_deposit_amounts()
+        now = datetime.utcnow()
+        
+        upsert = insert(DepositTransaction).values(
+            tenancy_agreement_id=agreement.id,
+            tenant_id=agreement.tenant_id,
+            landlord_id=agreement.landlord_id,
+            property_id=agreement.property_id,
+            amount=total_amount,
+            calculation_base=agreement.monthly_rent,
+            calculation_multiplier=Decimal('2.5'),  # 2 months security + 0.5 month utility
+            status=DepositTransactionStatus.HELD_IN_ESCROW,
+            payment_method='stripe',
+            payment_intent_id=payment_intent_id,
+            paid_at=now,
+            **DepositTransaction.agreement_snapshot_values(agreement)
+        ).on_conflict_do_update(
+            index_elements=['tenancy_agreement_id'],
+            set_={
+                'status': DepositTransactionStatus.HELD_IN_ESCROW,
+                'payment_method': 'stripe',
+                'payment_intent_id': payment_intent_id,
+                'paid_at': now,
+                'updated_at': now
+            }
+        ).returning(DepositTransaction.id)
+        deposit_id = db.session.execute(upsert).scalar_one()
+        
+        # No reads below may flush; the commit writes all changes in one flush
+        with db.session.no_autoflush:
+            # Activate the tenancy agreement
+            agreement.status = 'active'
+            agreement.activated_at = now
+            
+            # Update property status to RENTED
+            if agreement.property:
+                agreement.property.transition_to_rented()
+        
+        db.session.commit()
+        
+        logger.info(f"Deposit payment {payment_intent_id} recorded for agreement {agreement.id}")
+        return deposit_id
+    
+    def complete_deposit_from_webhook(self, agreement_id, payment_intent_id):
+        """
+        Record a deposit payment reported by the payment_intent.succeeded webhook
+        
+        Safe to run more than once and alongside the client's completion call:
+        agreements no longer awaiting deposit payment are left untouched.
+        
+        Args:
+            agreement_id (int): ID of the tenancy agreement from the intent metadata
+            payment_intent_id (str): ID of the succeeded PaymentIntent
+            
+        Returns:
+            dict: Result with success status
+        """
+        # Lock the agreement row so this and the client's completion call
+        # can't both record the payment
+        agreement = db.session.get(
+            TenancyAgreement, agreement_id,
+            options=[joinedload(TenancyAgreement.property)],
+            with_for_update={'of': TenancyAgreement}
+        )
+        if not agreement:
+            logger.warning(f"Deposit webhook for unknown agreement {agreement_id}: {payment_intent_id}")
+            return {'success': False, 'error': 'Tenancy agreement not found'}
+        
+        if agreement.status != 'website_fee_paid':
+            logger.info(f"Deposit webhook for agreement {agreement_id} ignored, status is {agreement.status}")
+            return {'success': True, 'message': 'Deposit already recorded'}
+        
+        deposit_id = self.record_stripe_deposit_payment(agreement, payment_intent_id)
+        return {'success': True, 'deposit_id': deposit_id}
+    
     def get_deposit_for_agreement(self, tenancy_agreement_id):
         """
         Get the deposit transaction for a specific tenancy agreement
@@ -147,34 +248,29 @@ class DepositService:
         Calculate deposit amount based on Malaysian standards
         
         Args:
-            monthly_rent (float): Monthly rent amount
+            monthly_rent (Decimal): Monthly rent amount
             property_type (str): Type of property
             
         Returns:
             dict: Calculated deposit amounts
         """
         try:
-            monthly_rent = float(monthly_rent)
-            
-            # Malaysian standard calculations
-            security_deposit = monthly_rent * 2.0  # 2 months
-            utility_deposit = monthly_rent * 0.5   # 0.5 month
+            # Malaysian standard calculations (2 months + 0.5 month), in Decimal
+            security_deposit, utility_deposit, total_amount = calculate_deposit_amounts(monthly_rent)
             
             # Property type adjustments (if needed in future)
-            if property_type == 'luxury':
-                security_deposit = monthly_rent * 2.5  # 2.5 months for luxury
-            elif property_type == 'commercial':
-                security_deposit = monthly_rent * 3.0  # 3 months for commercial
-            
-            total_amount = security_deposit + utility_deposit
+            multiplier = SECURITY_DEPOSIT_MONTHS.get(property_type)
+            if multiplier is not None:
+                security_deposit = (Decimal(str(monthly_rent)) * multiplier).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+                total_amount = security_deposit + utility_deposit
             
             return {
                 'success': True,
                 'calculation': {
-                    'monthly_rent': monthly_rent,
-                    'security_deposit': security_deposit,
-                    'utility_deposit': utility_deposit,
-                    'total_amount': total_amount,
+                    'monthly_rent': float(monthly_rent),
+                    'security_deposit': float(security_deposit),
+                    'utility_deposit': float(utility_deposit),
+                    'total_amount': float(total_amount),
                     'currency': 'MYR',
                     'calculation_method': 'malaysian_standard_2_months'
                 }
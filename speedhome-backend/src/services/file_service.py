@@ -5,6 +5,9 @@ from datetime import datetime
 from werkzeug.utils import secure_filename
 from flask import current_app
 
+# Copy uploads to disk in 1MB chunks (werkzeug's default is 16KB)
+UPLOAD_BUFFER_SIZE = 1024 * 1024
+
 
 class FileService:
     """Service for handling file uploads and management."""
@@ -18,14 +21,17 @@ class FileService:
     
     MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
     
-    DOCUMENT_TYPES = [
+    DOCUMENT_TYPES = (
         'id_document',
         'income_proof',
         'employment_letter',
         'bank_statement',
         'reference_letter',
         'credit_check'
-    ]
+    )
+    
+    # Set form of DOCUMENT_TYPES for membership checks; the tuple keeps display order
+    DOCUMENT_TYPE_SET = frozenset(DOCUMENT_TYPES)
     
     def __init__(self):
         self.upload_folder = os.path.join(current_app.root_path, '..', 'uploads', 'applications')
@@ -53,7 +59,7 @@ class FileService:
         if not file.filename:
             return False, "No filename provided"
         
-        if document_type not in self.DOCUMENT_TYPES:
+        if document_type not in self.DOCUMENT_TYPE_SET:
             return False, f"Invalid document type: {document_type}"
         
         # Check file size
@@ -147,7 +153,7 @@ class FileService:
             file_path = os.path.join(app_folder, filename)
             
             # Save file
-            file.save(file_path)
+            file.save(file_path, buffer_size=UPLOAD_BUFFER_SIZE)
             
             # Return relative path for database storage
             relative_path = os.path.join('uploads', 'applications', str(application_id), filename)
@@ -205,20 +211,60 @@ class FileService:
             if not os.path.exists(abs_path):
                 return None
             
-            stat = os.stat(abs_path)
-            
-            return {
-                'path': file_path,
-                'size': stat.st_size,
-                'created': datetime.fromtimestamp(stat.st_ctime),
-                'modified': datetime.fromtimestamp(stat.st_mtime),
-                'exists': True
-            }
+            return self._file_info(file_path, os.stat(abs_path))
             
         except Exception as e:
             current_app.logger.error(f"Error getting file info: {str(e)}")
             return None
     
+    def get_files_info(self, file_paths):
+        """
+        Get information about several files, listing each directory only once.
+        
+        Args:
+            file_paths: Relative paths to the files (empty values are skipped)
+            
+        Returns:
+            dict: File information (or None if missing) keyed by file path
+        """
+        files_info = {}
+        directory_entries = {}
+        
+        for file_path in file_paths:
+            if not file_path:
+                continue
+            
+            try:
+                abs_path = os.path.join(current_app.root_path, '..', file_path)
+                directory, name = os.path.split(abs_path)
+                
+                # One scandir per directory replaces an exists() check per file
+                if directory not in directory_entries:
+                    try:
+                        with os.scandir(directory) as entries:
+                            directory_entries[directory] = {entry.name: entry for entry in entries}
+                    except FileNotFoundError:
+                        directory_entries[directory] = {}
+                
+                entry = directory_entries[directory].get(name)
+                files_info[file_path] = self._file_info(file_path, entry.stat()) if entry else None
+                
+            except Exception as e:
+                current_app.logger.error(f"Error getting file info: {str(e)}")
+                files_info[file_path] = None
+        
+        return files_info
+    
+    def _file_info(self, file_path, stat):
+        """Build the file information dict from a stat result."""
+        return {
+            'path': file_path,
+            'size': stat.st_size,
+            'created': datetime.fromtimestamp(stat.st_ctime),
+            'modified': datetime.fromtimestamp(stat.st_mtime),
+            'exists': True
+        }
+    
     def cleanup_application_files(self, application_id):
         """
         Clean up all files for a specific application.
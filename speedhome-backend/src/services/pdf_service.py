@@ -89,21 +89,18 @@ class PDFService:
             dict: Paths to generated PDFs
         """
         try:
-            # Import here to avoid circular imports
-            from ..models.property import Property
-            
-            # Get the property data
-            property = Property.query.get(agreement.property_id)
-            if not property:
+            # Get the property data (already in the session when eager-loaded)
+            property_obj = agreement.property
+            if not property_obj:
                 raise ValueError(f"Property not found for agreement {agreement.id}")
             
             # Generate draft PDF
-            draft_path = self.generate_draft_pdf(agreement, property)
+            draft_path = self.generate_draft_pdf(agreement, property_obj)
             
             # Generate final PDF if agreement is completed
             final_path = None
             if agreement.status == 'active':
-                final_path = self.generate_final_pdf(agreement, property)
+                final_path = self.generate_final_pdf(agreement, property_obj)
             
             return {
                 'draft_pdf_path': draft_path,
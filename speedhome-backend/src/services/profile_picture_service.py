@@ -0,0 +1,83 @@
+"""
+Profile Picture Service
+
+Decodes base64 data URIs sent by the profile form, writes the image to the
+uploads directory and returns the URL to store on the user. Only the URL is
+kept in the database, so profile responses stay small and the images can be
+served (and cached) by the front-end server or a CDN.
+"""
+
+import base64
+import binascii
+import hashlib
+import os
+
+from flask import current_app
+
+# Public URL prefix for the uploads directory; point it at a CDN in production
+PROFILE_PICTURE_BASE_URL = os.environ.get('PROFILE_PICTURE_BASE_URL', '/uploads').rstrip('/')
+
+ALLOWED_IMAGE_TYPES = {
+    'image/jpeg': 'jpg',
+    'image/png': 'png',
+    'image/gif': 'gif',
+    'image/webp': 'webp'
+}
+
+MAX_IMAGE_SIZE = 2 * 1024 * 1024  # 2MB, matches the profile form limit
+
+MAX_PROFILE_PICTURE_URL_LENGTH = 512  # users.profile_picture column size
+
+
+def is_data_uri(value):
+    """True if value is an inline base64 data URI rather than a URL"""
+    return isinstance(value, str) and value.startswith('data:')
+
+
+def decode_data_uri(data_uri):
+    """
+    Split a base64 data URI into its content type and raw bytes.
+
+    Raises:
+        ValueError: If the URI is malformed, not an allowed image type or too large
+    """
+    header, sep, payload = data_uri.partition(',')
+    if not sep or not header.startswith('data:') or not header.endswith(';base64'):
+        raise ValueError('Image must be a base64 data URI')
+
+    content_type = header[len('data:'):-len(';base64')].lower()
+    if content_type not in ALLOWED_IMAGE_TYPES:
+        raise ValueError(f'Unsupported image type: {content_type or "unknown"}')
+
+    try:
+        image = base64.b64decode(payload, validate=True)
+    except (binascii.Error, ValueError):
+        raise ValueError('Image data is not valid base64')
+
+    if not image:
+        raise ValueError('Image is empty')
+    if len(image) > MAX_IMAGE_SIZE:
+        raise ValueError(f'Image exceeds maximum size of {MAX_IMAGE_SIZE // (1024 * 1024)}MB')
+
+    return content_type, image
+
+
+def save_profile_picture(user_id, data_uri):
+    """
+    Store a profile picture data URI and return its public URL.
+
+    Files are named by content hash, so re-uploading the same image reuses the
+    existing file and a changed image always gets a fresh, cacheable URL.
+    """
+    content_type, image = decode_data_uri(data_uri)
+    filename = f'{hashlib.sha256(image).hexdigest()[:32]}.{ALLOWED_IMAGE_TYPES[content_type]}'
+    relative_dir = os.path.join('avatars', str(user_id))
+
+    folder = os.path.join(current_app.root_path, '..', 'uploads', relative_dir)
+    os.makedirs(folder, exist_ok=True)
+    file_path = os.path.join(folder, filename)
+    if not os.path.exists(file_path):
+        with open(file_path, 'wb') as f:
+            f.write(image)
+
+    return f'{PROFILE_PICTURE_BASE_URL}/avatars/{user_id}/{filename}'
@@ -0,0 +1,109 @@
+"""
+Property Counter Service
+
+Buffers property view and inquiry counts in memory so a page view doesn't
+write to the properties table. While the background scheduler runs it flushes
+the buffer every few seconds with a single UPDATE for all touched properties,
+and once more when the process exits. Without the scheduler (or once the
+buffer grows past its cap) counts are written straight away instead, so they
+are never held indefinitely.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+
+from sqlalchemy import case, update
+
+from src.models.user import db
+from src.models.property import Property
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FLUSH_INTERVAL = 5  # seconds
+
+# Flush inline once this many (property, counter) pairs are waiting
+MAX_PENDING_COUNTERS = 1000
+
+# Counter columns that can be buffered
+COUNTERS = ('views', 'inquiries')
+
+_pending = defaultdict(int)  # (property_id, counter) -> increments not yet written
+_lock = threading.Lock()
+_buffering = False
+
+
+def start_buffering():
+    """Buffer counts from now on; the caller must flush() them periodically"""
+    global _buffering
+    _buffering = True
+
+
+def stop_buffering():
+    """Write counts immediately from now on (anything pending still needs a flush())"""
+    global _buffering
+    _buffering = False
+
+
+def record(property_id, counter):
+    """
+    Count one view or inquiry for a property and return how many of that
+    counter are not reflected in a row loaded before this call, so responses
+    can include them. Must run in an app context.
+    """
+    if counter not in COUNTERS:
+        raise ValueError(f'Unknown property counter: {counter}')
+
+    if not _buffering:
+        # Nothing would flush a buffer; do an atomic counter = counter + 1
+        table = Property.__table__
+        db.session.execute(
+            update(table).where(table.c.id == property_id).values({counter: table.c[counter] + 1})
+        )
+        db.session.commit()
+        return 1
+
+    with _lock:
+        _pending[(property_id, counter)] += 1
+        pending = _pending[(property_id, counter)]
+        over_cap = len(_pending) > MAX_PENDING_COUNTERS
+
+    if over_cap:
+        flush()
+    return pending
+
+
+def flush():
+    """
+    Write all pending counts in one UPDATE ... SET views = views + CASE id ...
+    and return the number of properties updated. Must run in an app context.
+    """
+    global _pending
+    with _lock:
+        batch, _pending = _pending, defaultdict(int)
+    if not batch:
+        return 0
+
+    increments = defaultdict(dict)  # counter -> {property_id: count}
+    for (property_id, counter), count in batch.items():
+        increments[counter][property_id] = count
+    property_ids = {property_id for property_id, _ in batch}
+
+    table = Property.__table__
+    values = {
+        counter: table.c[counter] + case(by_id, value=table.c.id, else_=0)
+        for counter, by_id in increments.items()
+    }
+    try:
+        db.session.execute(update(table).where(table.c.id.in_(property_ids)).values(values))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        # Put the counts back so the next flush retries them
+        with _lock:
+            for key, count in batch.items():
+                _pending[key] += count
+        raise
+
+    logger.debug("Flushed counters for %d properties", len(property_ids))
+    return len(property_ids)
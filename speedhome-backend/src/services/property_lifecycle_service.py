@@ -79,7 +79,7 @@ class PropertyLifecycleService:
             for agreement in all_agreements_to_process:
                 try:
                     # Get the associated property
-                    property_obj = Property.query.get(agreement.property_id)
+                    property_obj = db.session.get(Property, agreement.property_id)
                     
                     if property_obj and property_obj.status == PropertyStatus.RENTED:
                         # Check if there's a deposit transaction for this agreement
@@ -551,7 +551,7 @@ class PropertyLifecycleService:
             for agreement in stale_agreements:
                 try:
                     # Get the associated property
-                    property_obj = Property.query.get(agreement.property_id)
+                    property_obj = db.session.get(Property, agreement.property_id)
                     
                     if property_obj and property_obj.status == PropertyStatus.PENDING:
                         # Revert property status to Active
@@ -0,0 +1,90 @@
+"""
+Property Stats Service
+
+Aggregate listing statistics for the stats endpoint. The numbers scan the
+whole properties table, so they are cached for a few minutes and recomputed
+by the background scheduler rather than on every request. Adding, editing or
+removing a listing drops the cached copy; view and inquiry counters are bumped
+with bulk UPDATEs and only show up on the next refresh.
+"""
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session, object_session
+
+from src.models.user import db
+from src.models.property import Property, PropertyStatus
+from src.services.ttl_cache import TTLCache
+
+PROPERTY_STATS_CACHE_TTL = 300
+_stats_cache = TTLCache(ttl=PROPERTY_STATS_CACHE_TTL, maxsize=1)
+
+
+# Session.info key set when a flush changed a listing
+_STATS_STALE_KEY = 'property_stats_stale'
+
+
+@event.listens_for(Property, 'after_insert')
+@event.listens_for(Property, 'after_update')
+@event.listens_for(Property, 'after_delete')
+def _mark_stats_stale(mapper, connection, target):
+    # Dropped after commit, so a concurrent miss can't re-cache the old numbers
+    object_session(target).info[_STATS_STALE_KEY] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _drop_cached_stats(session):
+    if session.info.pop(_STATS_STALE_KEY, False):
+        _stats_cache.delete('stats')
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _keep_cached_stats(session, previous_transaction):
+    if not previous_transaction.nested:
+        session.info.pop(_STATS_STALE_KEY, None)
+
+
+def compute_property_stats():
+    """Run the aggregate query and return the stats dict"""
+    # One pass over the table: ROLLUP returns a row per property type plus a
+    # grand total row (grouping() = 1) carrying the overall counts and sums
+    rows = db.session.execute(select(
+        Property.property_type,
+        func.grouping(Property.property_type).label('is_total'),
+        func.count().label('total_properties'),
+        func.count().filter(Property.status == PropertyStatus.ACTIVE).label('active_properties'),
+        func.coalesce(func.sum(Property.views), 0).label('total_views'),
+        func.coalesce(func.sum(Property.inquiries), 0).label('total_inquiries'),
+        func.count().filter(Property.price < 1000).label('under_1000'),
+        func.count().filter(Property.price.between(1000, 2000)).label('price_1000_2000'),
+        func.count().filter(Property.price.between(2000, 3000)).label('price_2000_3000'),
+        func.count().filter(Property.price > 3000).label('over_3000')
+    ).group_by(func.rollup(Property.property_type))).all()
+
+    totals = next(row for row in rows if row.is_total)
+    property_types = {row.property_type: row.total_properties for row in rows if not row.is_total}
+
+    return {
+        'total_properties': totals.total_properties,
+        'active_properties': totals.active_properties,
+        'total_views': totals.total_views,
+        'total_inquiries': totals.total_inquiries,
+        'property_types': property_types,
+        'price_ranges': {
+            'under_1000': totals.under_1000,
+            '1000_2000': totals.price_1000_2000,
+            '2000_3000': totals.price_2000_3000,
+            'over_3000': totals.over_3000
+        }
+    }
+
+
+def get_property_stats():
+    """Return the cached stats, computing them on a miss"""
+    return _stats_cache.get_or_set('stats', compute_property_stats)
+
+
+def refresh_property_stats():
+    """Recompute the stats and replace the cached copy"""
+    stats = compute_property_stats()
+    _stats_cache.set('stats', stats)
+    return stats
@@ -5,16 +5,68 @@ Handles agreement fee payments and subscription management
 
 import os
 import stripe
+import requests
 import logging
+import random
+import threading
+import time
 from datetime import datetime
+from decimal import Decimal
 from flask import current_app
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
+# One pooled HTTPS session shared by every worker thread, so Stripe calls reuse
+# warm keep-alive connections instead of each thread doing its own TLS handshake.
+# Retries stay off here; rate limits are handled by call_with_retry.
+_stripe_session = requests.Session()
+_stripe_session.mount('https://', HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=0))
+stripe.default_http_client = stripe.RequestsClient(session=_stripe_session)
+
+# How long a succeeded payment intent is served from memory
+SUCCEEDED_INTENT_TTL = 300
+
+# Retries for Stripe rate limiting (429) and connection failures; rate-limit
+# backoff is 1s, 2s, 4s and connection backoff 0.5s, 1s, 2s, each plus jitter
+STRIPE_MAX_RETRIES = 3
+
+def call_with_retry(fn, *args, max_retries=STRIPE_MAX_RETRIES, **kwargs):
+    """
+    Call a Stripe API function, retrying with exponential backoff on 429s and
+    connection errors
+    
+    Pass idempotency_key for create calls so a retried request can never
+    create a second object. Stripe's Retry-After header is honoured when sent.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return fn(*args, **kwargs)
+        except stripe.error.RateLimitError as e:
+            if attempt >= max_retries:
+                raise
+            retry_after = (e.headers or {}).get('retry-after')
+            delay = float(retry_after) if retry_after else (2 ** attempt) + random.random()
+            logger.warning(f"Stripe rate limited, retrying in {delay:.1f}s (attempt {attempt + 1}/{max_retries})")
+            time.sleep(delay)
+        except stripe.error.APIConnectionError as e:
+            if attempt >= max_retries:
+                raise
+            delay = 0.5 * (2 ** attempt) + random.random() * 0.25
+            logger.warning(f"Stripe connection error ({e}), retrying in {delay:.1f}s (attempt {attempt + 1}/{max_retries})")
+            time.sleep(delay)
+
+def to_cents(amount):
+    """Convert an RM amount to integer sen for Stripe without float truncation"""
+    return int((Decimal(str(amount)) * 100).to_integral_value())
+
 class StripeService:
     """Service for managing payments with Stripe"""
     
     def __init__(self):
+        self._succeeded_intents = {}
+        self._intent_cache_lock = threading.Lock()
+
         self.api_key = os.getenv('STRIPE_SECRET_KEY')
         self.publishable_key = os.getenv('STRIPE_PUBLISHABLE_KEY')
         self.webhook_secret = os.getenv('STRIPE_WEBHOOK_SECRET')
@@ -36,7 +88,7 @@ class StripeService:
         """
         try:
             # Convert RM to cents (Stripe uses smallest currency unit)
-            amount_cents = int(float(agreement.payment_required) * 100)
+            amount_cents = to_cents(agreement.payment_required)
             
             payment_intent = stripe.PaymentIntent.create(
                 amount=amount_cents,
@@ -114,7 +166,7 @@ class StripeService:
             dict: Payment intent data
         """
         try:
-            payment_intent = stripe.PaymentIntent.retrieve(payment_intent_id)
+            payment_intent = call_with_retry(stripe.PaymentIntent.retrieve, payment_intent_id)
             
             return {
                 'success': True,
@@ -131,6 +183,38 @@ class StripeService:
                 'error': str(e)
             }
     
+    def get_payment_intent_cached(self, payment_intent_id):
+        """
+        Retrieve a payment intent, reusing a recent result once it has succeeded
+        
+        'succeeded' is a terminal status, so repeated completion calls (and
+        calls after the payment_intent.succeeded webhook) skip the Stripe request.
+        
+        Args:
+            payment_intent_id: Stripe payment intent ID
+            
+        Returns:
+            dict: Payment intent data, same shape as get_payment_intent
+        """
+        with self._intent_cache_lock:
+            cached = self._succeeded_intents.get(payment_intent_id)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        
+        result = self.get_payment_intent(payment_intent_id)
+        if result['success'] and result['status'] == 'succeeded':
+            self._cache_succeeded_intent(payment_intent_id, result)
+        return result
+    
+    def _cache_succeeded_intent(self, payment_intent_id, result):
+        """Remember a succeeded payment intent for SUCCEEDED_INTENT_TTL seconds"""
+        now = time.monotonic()
+        with self._intent_cache_lock:
+            # Drop expired entries so the cache does not grow without bound
+            for key in [k for k, (expires, _) in self._succeeded_intents.items() if expires <= now]:
+                del self._succeeded_intents[key]
+            self._succeeded_intents[payment_intent_id] = (now + SUCCEEDED_INTENT_TTL, result)
+    
     def create_customer(self, tenant_email, tenant_name):
         """
         Create a Stripe customer
@@ -238,6 +322,15 @@ class StripeService:
         agreement_id = payment_intent.get('metadata', {}).get('agreement_id')
         logger.info(f"Payment succeeded for agreement {agreement_id}: {payment_intent['id']}")
         
+        # Prime the cache so the client's completion call needs no Stripe round-trip
+        self._cache_succeeded_intent(payment_intent['id'], {
+            'success': True,
+            'payment_intent': payment_intent,
+            'status': payment_intent['status'],
+            'amount': payment_intent['amount'] / 100,
+            'currency': payment_intent['currency'].upper()
+        })
+        
         # This will be implemented in the workflow coordinator
         return {'success': True, 'message': 'Payment processed'}
     
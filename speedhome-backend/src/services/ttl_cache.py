@@ -0,0 +1,66 @@
+"""
+TTL Cache Service
+
+Small thread-safe in-process cache for read-heavy endpoints. Entries expire
+after a fixed time and the least recently used ones are evicted once the cache
+is full. Each process keeps its own copy, so writers must call delete() (or
+rely on the TTL) for changes to become visible.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+# Returned by get() on a miss, so None can be cached
+MISSING = object()
+
+
+class TTLCache:
+    """In-process key/value cache with expiry and LRU eviction"""
+
+    def __init__(self, ttl, maxsize=1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=MISSING):
+        """Return the cached value for key, or default if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        """Cache value under key for ttl seconds (defaults to the cache TTL)"""
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_set(self, key, build, ttl=None):
+        """Return the cached value for key, calling build() to fill a miss"""
+        value = self.get(key)
+        if value is MISSING:
+            value = build()
+            self.set(key, value, ttl=ttl)
+        return value
+
+    def delete(self, *keys):
+        """Drop the given keys; missing keys are ignored"""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
@@ -288,7 +288,7 @@ class WorkflowCoordinator:
             agreement.updated_at = datetime.utcnow()
             
             # Revert property from Pending back to Active when agreement is cancelled
-            property_obj = Property.query.get(agreement.property_id)
+            property_obj = db.session.get(Property, agreement.property_id)
             if property_obj and property_obj.status == PropertyStatus.PENDING:
                 if property_obj.transition_to_active():
                     logger.info(f"Property {property_obj.id} reverted to Active status after agreement cancellation")
@@ -293,10 +293,14 @@ const HomePage = ({
     locations,
     setShowMoreFiltersModal,
     filteredProperties,
+    propertiesFoundCount,
     viewMode,
     setViewMode,
     isFavorite,
-    toggleFavorite
+    toggleFavorite,
+    hasMoreProperties,
+    loadingMoreProperties,
+    onLoadMoreProperties
 }) => (
     <div className="bg-gray-100 py-8 px-4 sm:px-6 lg:px-8">
       <div className="max-w-7xl mx-auto">
@@ -357,7 +361,7 @@ const HomePage = ({
         </div>
 
         <div className="flex justify-between items-center mb-4">
-            <div className="text-sm text-gray-600">{filteredProperties.length} properties found</div>
+            <div className="text-sm text-gray-600">{propertiesFoundCount} properties found</div>
             <div className="flex border border-gray-300 rounded-lg overflow-hidden">
               <button onClick={() => setViewMode('grid')} className={`px-4 py-2 text-sm ${viewMode === 'grid' ? 'bg-yellow-500 text-white' : 'bg-white text-gray-700'}`}>Grid</button>
               <button onClick={() => setViewMode('list')} className={`px-4 py-2 text-sm ${viewMode === 'list' ? 'bg-yellow-500 text-white' : 'bg-white text-gray-700'}`}>List</button>
@@ -396,12 +400,24 @@ const HomePage = ({
           ))}
         </div>
 
-        {filteredProperties.length === 0 && (
+        {filteredProperties.length === 0 && !hasMoreProperties && (
           <div className="text-center py-12">
             <h3 className="mt-2 text-sm font-medium text-gray-900">No properties found</h3>
             <p className="mt-1 text-sm text-gray-500">Try adjusting your search criteria.</p>
           </div>
         )}
+
+        {hasMoreProperties && (
+          <div className="text-center mt-8">
+            <button
+              onClick={onLoadMoreProperties}
+              disabled={loadingMoreProperties}
+              className="px-6 py-2 bg-yellow-500 text-white rounded-lg hover:bg-yellow-600 disabled:opacity-50"
+            >
+              {loadingMoreProperties ? 'Loading...' : 'Load more properties'}
+            </button>
+          </div>
+        )}
       </div>
     </div>
 );
@@ -416,8 +432,15 @@ const TenantPage = () => (
 );
 
 
+// Listings fetched per page on the home page
+const PROPERTIES_PAGE_SIZE = 20;
+
 function AppContent() {
   const [properties, setProperties] = useState([]);
+  const [propertiesCursor, setPropertiesCursor] = useState(null);
+  const [loadingMoreProperties, setLoadingMoreProperties] = useState(false);
+  const [propertiesTotal, setPropertiesTotal] = useState(null);
+  const [morePropertiesFailed, setMorePropertiesFailed] = useState(false);
   const [searchTerm, setSearchTerm] = useState('');
   const [searchInput, setSearchInput] = useState('');
   const [favorites, setFavorites] = useState([]);
@@ -438,6 +461,11 @@ function AppContent() {
 
   const { user, isAuthenticated } = useAuth();
   const [notifications, setNotifications] = useState([]);
+  // Length of the list currently shown, compared against the polled unread count
+  const notificationCountRef = useRef(0);
+  useEffect(() => {
+    notificationCountRef.current = notifications.length;
+  }, [notifications]);
 
   const initialFilters = {
     location: 'All Locations',
@@ -508,7 +536,19 @@ function AppContent() {
       return;
     }
 
+    // Poll the unread count and only fetch the full list when it changes
     const fetchNotifications = async () => {
+      const countResult = await NotificationAPI.getUnreadCount();
+      if (!countResult.success) {
+        return;
+      }
+      if (countResult.count === 0) {
+        setNotifications([]);
+        return;
+      }
+      if (countResult.count === notificationCountRef.current) {
+        return;
+      }
       const result = await NotificationAPI.getNotifications();
       if (result.success) {
         setNotifications(result.notifications);
@@ -604,19 +644,27 @@ function AppContent() {
   ];
 
   useEffect(() => {
+    // First page only; more pages are fetched with "Load more", or all of
+    // them once a search or filter is in use
     const loadProperties = async () => {
       try {
-        const response = await fetch('http://localhost:5001/api/properties');
-        if (response.ok) {
-          const data = await response.json();
+        const data = await PropertyAPI.getProperties({ limit: PROPERTIES_PAGE_SIZE, with_total: 1 });
+        if (data.success) {
           setProperties(data.properties || []);
+          setPropertiesCursor(data.pagination?.has_next ? data.pagination.next_cursor : null);
+          setPropertiesTotal(data.pagination?.total ?? null);
+          setMorePropertiesFailed(false);
         } else {
           console.error('Failed to load properties from API');
           setProperties([]);
+          setPropertiesCursor(null);
+          setPropertiesTotal(null);
         }
       } catch (error) {
         console.error('Error loading properties:', error);
         setProperties([]);
+        setPropertiesCursor(null);
+        setPropertiesTotal(null);
       }
     };
 
@@ -638,6 +686,37 @@ function AppContent() {
     };
   }, []);
 
+  const loadMoreProperties = async () => {
+    if (!propertiesCursor || loadingMoreProperties) return;
+    setLoadingMoreProperties(true);
+    try {
+      const data = await PropertyAPI.getProperties({ limit: PROPERTIES_PAGE_SIZE, before: propertiesCursor });
+      if (data.success) {
+        setProperties(prev => [...prev, ...(data.properties || [])]);
+        setPropertiesCursor(data.pagination?.has_next ? data.pagination.next_cursor : null);
+        setMorePropertiesFailed(false);
+      } else {
+        console.error('Failed to load more properties from API');
+        setMorePropertiesFailed(true);
+      }
+    } catch (error) {
+      console.error('Error loading more properties:', error);
+      setMorePropertiesFailed(true);
+    } finally {
+      setLoadingMoreProperties(false);
+    }
+  };
+
+  // Search and filters run on the loaded listings, so while any is in use
+  // keep fetching pages until every listing is loaded. After a failed page
+  // this stops; "Load more" retries it.
+  const filtersActive = searchTerm !== '' || JSON.stringify(filters) !== JSON.stringify(initialFilters);
+  useEffect(() => {
+    if (filtersActive && propertiesCursor && !loadingMoreProperties && !morePropertiesFailed) {
+      loadMoreProperties();
+    }
+  }, [filtersActive, propertiesCursor, loadingMoreProperties, morePropertiesFailed]);
+
   useEffect(() => {
     localStorage.setItem('speedhomeFavorites', JSON.stringify(favorites));
   }, [favorites]);
@@ -709,6 +788,9 @@ function AppContent() {
     return matchesSearch && matchesLocation && matchesPrice && matchesFurnish && matchesType && matchesAmenities && matchesZeroDeposit && matchesPetFriendly && matchesAvailability && matchesBedrooms && matchesBathrooms && matchesParking;
   });
 
+  // Unfiltered, only the first pages may be loaded; the server's total counts them all
+  const propertiesFoundCount = filtersActive || propertiesTotal === null ? filteredProperties.length : propertiesTotal;
+
   const clearAllFilters = () => {
     setSearchTerm('');
     setSearchInput('');
@@ -775,10 +857,14 @@ function AppContent() {
                 locations={locations}
                 setShowMoreFiltersModal={setShowMoreFiltersModal}
                 filteredProperties={filteredProperties}
+                propertiesFoundCount={propertiesFoundCount}
                 viewMode={viewMode}
                 setViewMode={setViewMode}
                 isFavorite={isFavorite}
                 toggleFavorite={toggleFavorite}
+                hasMoreProperties={Boolean(propertiesCursor)}
+                loadingMoreProperties={loadingMoreProperties}
+                onLoadMoreProperties={loadMoreProperties}
             />
         } />
         <Route path="/property/:propertyId" element={<PropertyDetailPage key={detailPageVersion} properties={properties} isFavorite={isFavorite} toggleFavorite={toggleFavorite} setSelectedProperty={setSelectedProperty} onApplyClick={(hasAppliedSetter) => {
@@ -1001,7 +1087,7 @@ function AppContent() {
                     <div className="p-6 border-t mt-auto flex justify-between items-center bg-gray-50 rounded-b-xl">
                     <button onClick={clearAllFilters} className="text-gray-600 hover:text-black font-semibold">Reset Filter</button>
                     <button onClick={() => setShowMoreFiltersModal(false)} className="px-6 py-3 bg-yellow-500 text-white rounded-lg hover:bg-yellow-600 font-semibold">
-                        Filter ({filteredProperties.length})
+                        Filter ({propertiesFoundCount})
                     </button>
                     </div>
                 </div>
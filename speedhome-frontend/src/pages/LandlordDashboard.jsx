@@ -148,7 +148,8 @@ const LandlordDashboard = ({ onAddProperty }) => {
 
     try {
       setLoading(true);
-      const result = await PropertyAPI.getPropertiesByOwner(user.id);
+      // The overview totals and booking/application lookups need every listing
+      const result = await PropertyAPI.getAllPropertiesByOwner(user.id);
 
       if (result.success) {
         setProperties(result.properties);
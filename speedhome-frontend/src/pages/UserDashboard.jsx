@@ -243,7 +243,7 @@ const UserDashboard = ({ favorites, toggleFavorite }) => {
       return;
     }
     try {
-      const result = await PropertyAPI.getPropertiesForFavorites();
+      const result = await PropertyAPI.getPropertiesForFavorites({ ids: favorites.join(','), limit: 100 });
       if (result.success) {
         const userFavorites = result.properties.filter(p => favorites.includes(p.id));
         setFavoritedProperties(userFavorites);
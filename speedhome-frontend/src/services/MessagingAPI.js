@@ -32,12 +32,16 @@ class MessagingAPI {
     /**
      * Get messages for a specific conversation
      * @param {number} conversationId - The conversation ID
-     * @param {number} page - Page number for pagination (default: 1)
-     * @param {number} perPage - Messages per page (default: 50)
+     * @param {string|null} before - pagination.next_cursor ("<created_at>,<id>") from the previous page, for older messages (default: newest)
+     * @param {number} limit - Messages per page (default: 50)
      */
-    async getMessages(conversationId, page = 1, perPage = 50) {
+    async getMessages(conversationId, before = null, limit = 50) {
         try {
-            const response = await fetch(`${this.baseURL}/conversations/${conversationId}/messages?page=${page}&per_page=${perPage}`, {
+            const params = new URLSearchParams({ limit });
+            if (before) {
+                params.set('before', before);
+            }
+            const response = await fetch(`${this.baseURL}/conversations/${conversationId}/messages?${params}`, {
                 method: 'GET',
                 credentials: 'include',
                 headers: {
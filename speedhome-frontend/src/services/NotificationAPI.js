@@ -35,6 +35,35 @@ class NotificationAPI {
       }
     }
   
+    /**
+     * Fetches the number of unread notifications, for polling the header badge.
+     * @returns {Promise<object>} A promise that resolves to { success, count }.
+     */
+    static async getUnreadCount() {
+      try {
+        const response = await fetch('/api/notifications/count', {
+          method: 'GET',
+          headers: {
+            'Content-Type': 'application/json',
+          },
+          credentials: 'include',
+        });
+  
+        if (!response.ok) {
+          if (response.status === 401) {
+            return { success: false, count: 0 };
+          }
+          const data = await response.json();
+          throw new Error(data.error || 'Failed to fetch notification count');
+        }
+  
+        return await response.json();
+      } catch (error) {
+        console.error('Error fetching notification count:', error);
+        return { success: false, count: 0 };
+      }
+    }
+  
     /**
      * Marks a list of notification IDs as read.
      * @param {number[]} ids - An array of notification IDs to mark as read.
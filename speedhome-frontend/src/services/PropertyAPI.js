@@ -138,10 +138,15 @@ class PropertyAPI {
     }
   }
 
-  // Get properties by owner (for landlord dashboard)
-  static async getPropertiesByOwner(ownerId) {
+  // Get one page of a landlord's properties, newest first; pass
+  // pagination.next_cursor from the previous page as `before` for the next one
+  static async getPropertiesByOwner(ownerId, { before = null, limit = 20 } = {}) {
     try {
-      const response = await fetch(`${API_BASE_URL}/properties/owner/${ownerId}`, {
+      const params = new URLSearchParams({ limit });
+      if (before) {
+        params.set('before', before);
+      }
+      const response = await fetch(`${API_BASE_URL}/properties/owner/${ownerId}?${params}`, {
         method: 'GET',
         headers: {
           'Content-Type': 'application/json',
@@ -153,14 +158,31 @@ class PropertyAPI {
         throw new Error(`HTTP error! status: ${response.status}`);
       }
       
-      const data = await response.json();
-      return data;
+      return await response.json();
     } catch (error) {
       console.error('Error fetching properties by owner:', error);
       return { success: false, error: 'Failed to fetch properties' };
     }
   }
 
+  // Get every property of one landlord by following the pagination cursor.
+  // Only for views that need the full set (the landlord dashboard totals);
+  // lists should page with getPropertiesByOwner instead
+  static async getAllPropertiesByOwner(ownerId) {
+    const properties = [];
+    let before = null;
+    do {
+      const data = await this.getPropertiesByOwner(ownerId, { before, limit: 100 });
+      if (!data.success) {
+        return data;
+      }
+      properties.push(...data.properties);
+      before = data.pagination?.has_next ? data.pagination.next_cursor : null;
+    } while (before);
+
+    return { success: true, properties, count: properties.length };
+  }
+
   // Search properties with advanced filters
   static async searchProperties(searchParams = {}) {
     try {
@@ -19,6 +19,11 @@ export default defineConfig({
         target: 'http://127.0.0.1:5001',
         changeOrigin: true,
         secure: false
+      },
+      '/uploads': {
+        target: 'http://127.0.0.1:5001',
+        changeOrigin: true,
+        secure: false
       }
     }
   }